@@ -0,0 +1,185 @@
+import os
+from pathlib import Path
+
+import numpy as np
+
+# Bump when the generated content changes, so cached files are regenerated
+GENERATOR_VERSION = 1
+SAMPLE_INTERVAL = 1e-6
+BLOCK_ROWS = 1 << 20
+
+# Layout of the synthetic binary captures, as BinaryImportDialog.get_params() describes it
+BINARY_PARAMS = {
+    'endian': 'Little',
+    'dtype': 'int16',
+    'offset_bytes': 512,
+    'length_bytes': 0,
+    'sample_rate_hz': 1 / SAMPLE_INTERVAL,
+    'scale_v_per_unit': 1 / 8192,
+    'v_offset': 0.0,
+    'channel_count': 4,
+    'channel_index': 0,
+    'auto_detect': False,
+    'memory_map': False,
+    'storage_dtype': 'float64',
+    'use_points': False,
+    'points_per_channel': 0,
+}
+
+
+def signals(start, rows, channels=1):
+    """Deterministic test waveforms for rows [start, start + rows): (time, [values per channel])."""
+    t = np.arange(start, start + rows) * SAMPLE_INTERVAL - 1e-3
+    rng = np.random.default_rng(start)
+    values = [np.sin(t * 2e4 * (ch + 1)) + 0.01 * rng.standard_normal(rows)
+              for ch in range(channels)]
+    return t, values
+
+
+def _scientific(v):
+    """
+    Characters of each value of ``v`` as '%.6E' prints it (e.g. '-9.116880E-01'), as a
+    (len(v), 13) uint8 array padded with zero bytes; far faster than string formatting.
+    """
+    a = np.abs(v)
+    exp = np.zeros(len(v), dtype=np.int64)
+    nonzero = a > 0
+    exp[nonzero] = np.floor(np.log10(a[nonzero]))
+    mant = np.rint(a / 10.0 ** exp * 1e6).astype(np.int64)
+    # log10 can be off by one near powers of ten, and rounding can carry into a new digit
+    low = nonzero & (mant < 1_000_000)
+    exp[low] -= 1
+    mant[low] = np.rint(a[low] / 10.0 ** exp[low] * 1e6)
+    high = mant >= 10_000_000
+    exp[high] += 1
+    mant[high] = np.rint(a[high] / 10.0 ** exp[high] * 1e6)
+
+    out = np.zeros((len(v), 13), dtype=np.uint8)
+    out[:, 0] = np.where(np.signbit(v), ord('-'), 0)
+    digits = mant[:, None] // 10 ** np.arange(6, -1, -1) % 10 + ord('0')
+    out[:, 1] = digits[:, 0]
+    out[:, 2] = ord('.')
+    out[:, 3:9] = digits[:, 1:]
+    out[:, 9] = ord('E')
+    out[:, 10] = np.where(exp < 0, ord('-'), ord('+'))
+    e = np.abs(exp)
+    out[:, 11] = e // 10 + ord('0')
+    out[:, 12] = e % 10 + ord('0')
+    return out
+
+
+def csv_rows(columns):
+    """CSV data rows (bytes) of equally long float columns, values formatted like '%.6E'."""
+    rows = len(columns[0])
+    parts = []
+    for i, column in enumerate(columns):
+        parts.append(_scientific(np.asarray(column, dtype=np.float64)))
+        parts.append(np.full((rows, 1), ord(',' if i < len(columns) - 1 else '\n'), dtype=np.uint8))
+    chars = np.hstack(parts).ravel()
+    return chars[chars != 0].tobytes()
+
+
+class CSVFormat:
+    """
+    A synthetic CSV capture format: ``header(rows)`` returns the text before the data,
+    ``columns(t, values)`` the data columns of a block of rows.
+    """
+    suffix = '.csv'
+
+    def __init__(self, name, parser, header, columns, channels=1):
+        self.name = name
+        self.parser = parser  # Class name of the parser expected to pick the file
+        self.header = header
+        self.columns = columns
+        self.channels = channels
+
+    def block(self, start, rows):
+        t, values = signals(start, rows, self.channels)
+        return csv_rows(self.columns(t, values))
+
+    def write(self, path, target_bytes):
+        """Write a file of about ``target_bytes``; returns its number of data rows."""
+        rows = max(1, int(target_bytes * 1000 / len(self.block(0, 1000))))
+        with open(path, 'wb') as f:
+            f.write(self.header(rows).encode())
+            for start in range(0, rows, BLOCK_ROWS):
+                f.write(self.block(start, min(BLOCK_ROWS, rows - start)))
+        return rows
+
+
+class BinaryFormat:
+    """Interleaved int16 samples of BINARY_PARAMS['channel_count'] channels behind a header."""
+    name = 'binary'
+    parser = 'read_binary_capture'
+    suffix = '.bin'
+
+    def write(self, path, target_bytes):
+        channels = BINARY_PARAMS['channel_count']
+        header = BINARY_PARAMS['offset_bytes']
+        rows = max(1, (target_bytes - header) // (2 * channels))
+        with open(path, 'wb') as f:
+            f.write(b'\x00' * header)
+            for start in range(0, rows, BLOCK_ROWS):
+                _, values = signals(start, min(BLOCK_ROWS, rows - start), channels)
+                samples = np.stack(values, axis=1) / BINARY_PARAMS['scale_v_per_unit']
+                f.write(samples.astype('<i2').tobytes())
+        return rows
+
+
+def _display_columns(t, values):
+    columns = [t]
+    for v in values:
+        columns += [v - 0.05, v + 0.05]
+    return columns
+
+
+FORMATS = {fmt.name: fmt for fmt in [
+    CSVFormat('siglent', 'SiglentCSVParser',
+              lambda rows: (f'Record Length,Analog:{rows}\nSample Interval,{SAMPLE_INTERVAL}\n'
+                            'Model Number,SDS1104X-E\nSecond,Value\n'),
+              lambda t, values: [t, values[0]]),
+    CSVFormat('batronix', 'BatronixCSVParser',
+              lambda rows: ('Batronix Magnova\ntime difference to trigger in s,-1E-3\n'
+                            'time in s,CH1 in V\n'),
+              lambda t, values: [t, values[0]]),
+    CSVFormat('batronix_display', 'BatronixDisplayCSVParser',
+              lambda rows: ('start time in s,time difference in s\n'
+                            f'-1.000000E-003,{SAMPLE_INTERVAL:.6E}\n'
+                            'time in s,' + ','.join(f'CH{ch} minimum in V,CH{ch} maximum in V'
+                                                    for ch in range(1, 5)) + '\n'),
+              _display_columns, channels=4),
+    CSVFormat('rigol', 'RigolCSVParser',
+              lambda rows: 'Time(s),CH1V\n',
+              lambda t, values: [t, values[0]]),
+    CSVFormat('rigol_arb', 'RigolArbCSVParser',
+              lambda rows: (f'RIGOL:CSV DATA FILE\nType:Arb\nSample Rate:{1 / SAMPLE_INTERVAL:.0f}\n'
+                            f'DATA Number:{rows}\n'),
+              lambda t, values: [values[0]]),
+    CSVFormat('pyqtgraph', 'PyqtgraphCSVParser',
+              lambda rows: 'x0000,y0000\n',
+              lambda t, values: [t, values[0]]),
+    BinaryFormat(),
+]}
+
+
+def generate(format_name, size_bytes, directory):
+    """
+    Return (path, rows) of a synthetic ``format_name`` capture of about ``size_bytes``
+    in ``directory``, writing it unless it was generated before.
+    """
+    fmt = FORMATS[format_name]
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f'{format_name}-{size_bytes}-v{GENERATOR_VERSION}{fmt.suffix}'
+    rows_path = path.with_name(path.name + '.rows')
+    if path.exists() and rows_path.exists():
+        return path, int(rows_path.read_text())
+    tmp = path.with_name(f'.{path.name}.tmp-{os.getpid()}')
+    try:
+        rows = fmt.write(tmp, size_bytes)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    rows_path.write_text(str(rows))
+    return path, rows
@@ -0,0 +1,225 @@
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from .generators import BINARY_PARAMS, FORMATS, generate
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SIZES = '1MB,16MB,128MB'
+REPORT_VERSION = 1
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def parse_size(text):
+    """'1MB', '2.5GB', '4096' -> bytes."""
+    m = re.fullmatch(r'\s*([\d.]+)\s*([kmgt]?)i?b?\s*', text.lower())
+    if not m:
+        raise ValueError(f"Invalid size: {text!r}")
+    return int(float(m.group(1)) * 1024 ** ' kmgt'.index(m.group(2) or ' '))
+
+
+def format_size(size):
+    for unit in ('B', 'KB', 'MB', 'GB', 'TB'):
+        if size < 1024 or unit == 'TB':
+            return f'{size:g}{unit}'
+        size /= 1024
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far, or None where it is not available."""
+    # ru_maxrss survives fork and exec on Linux, so it would report the benchmark
+    # process's own peak (from generating files) instead; VmHWM starts over with exec
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def run_case(format_name, path):
+    """
+    Parse one file the way the viewer does and return its measurements. Meant to run
+    in a fresh process (see ``measure``) so that the peak RSS belongs to this parse.
+    """
+    from oscilloscope_core import read_binary_capture
+    from parsers import PARSER_REGISTRY
+    import_peak = peak_rss_bytes()
+
+    started = time.perf_counter()
+    if format_name == 'binary':
+        parser_name = 'read_binary_capture'
+        metadata, data = read_binary_capture(path, BINARY_PARAMS)
+    else:
+        parser, head = PARSER_REGISTRY.sniff(path)
+        parser_name = parser.__class__.__name__ if parser else None
+        if parser_name != FORMATS[format_name].parser:
+            raise RuntimeError(f"{path} was sniffed as {parser_name}, "
+                               f"expected {FORMATS[format_name].parser}")
+        metadata, data = parser.parse(path, head=head)
+    wall = time.perf_counter() - started
+
+    return {
+        'parser': parser_name,
+        'rows': len(data),
+        'wall_s': wall,
+        'peak_rss_bytes': peak_rss_bytes(),
+        'import_peak_rss_bytes': import_peak,
+        'data_bytes': int(data.memory_usage(index=False, deep=True).sum()),
+        'engine': metadata.get('Parse Engine', [None])[0],
+        'workers': metadata.get('Parse Workers', [None])[0],
+    }
+
+
+def measure(format_name, path):
+    """Run ``run_case`` in a fresh interpreter and return its result."""
+    proc = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.parse_benchmark', '--run-case', format_name, str(path)],
+        cwd=REPO_ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{format_name} {path}: {proc.stderr.strip().splitlines()[-1:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def environment():
+    """What the numbers depend on besides the code."""
+    import numpy
+    import pandas
+    try:
+        import pyarrow
+        pyarrow_version = pyarrow.__version__
+    except ImportError:
+        pyarrow_version = None
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'numpy': numpy.__version__,
+        'pandas': pandas.__version__,
+        'pyarrow': pyarrow_version,
+        'cpu_count': os.cpu_count(),
+        'settings': {k: v for k, v in os.environ.items() if k.startswith('OSCILLOSCOPE_VIEWER_')},
+    }
+
+
+def benchmark(formats, sizes, repeat=3, data_dir=None, log=print):
+    """
+    Generate (or reuse) a file per format and size, parse each ``repeat`` times in a
+    fresh process, and return the report: the environment plus one result per case
+    with the median wall time, the throughput derived from it and the highest peak RSS.
+    """
+    data_dir = Path(data_dir or Path(tempfile.gettempdir()) / 'oscilloscope_viewer_bench')
+    results = []
+    for format_name in formats:
+        for size in sizes:
+            path, _ = generate(format_name, size, data_dir)
+            file_bytes = path.stat().st_size
+            runs = [measure(format_name, path) for _ in range(repeat)]
+            wall = statistics.median(run['wall_s'] for run in runs)
+            peaks = [run['peak_rss_bytes'] for run in runs if run['peak_rss_bytes'] is not None]
+            result = {
+                'format': format_name,
+                'size': format_size(size),
+                'file_bytes': file_bytes,
+                'parser': runs[0]['parser'],
+                'engine': runs[0]['engine'],
+                'workers': runs[0]['workers'],
+                'rows': runs[0]['rows'],
+                'repeat': repeat,
+                'wall_s': round(wall, 4),
+                'wall_s_min': round(min(run['wall_s'] for run in runs), 4),
+                'mb_s': round(file_bytes / wall / 1e6, 1),
+                'rows_s': round(runs[0]['rows'] / wall),
+                'peak_rss_mb': round(max(peaks) / 1e6, 1) if peaks else None,
+                'import_rss_mb': round(runs[0]['import_peak_rss_bytes'] / 1e6, 1) if peaks else None,
+                'data_mb': round(runs[0]['data_bytes'] / 1e6, 1),
+            }
+            results.append(result)
+            log(f"{format_name:>16} {result['size']:>7}  {result['mb_s']:8.1f} MB/s "
+                f"{result['rows_s']:>12,} rows/s  {result['wall_s']:8.3f} s  "
+                f"peak RSS {result['peak_rss_mb']} MB")
+    return {'version': REPORT_VERSION, 'environment': environment(), 'results': results}
+
+
+def compare_reports(old, new):
+    """Lines comparing throughput and peak RSS of the cases two reports have in common."""
+    old_results = {(r['format'], r['size']): r for r in old['results']}
+    lines = [f"{'format':>16} {'size':>7}  {'old MB/s':>9} {'new MB/s':>9} {'change':>8}  "
+             f"{'old RSS':>8} {'new RSS':>8}"]
+    for r in new['results']:
+        o = old_results.get((r['format'], r['size']))
+        if o is None:
+            continue
+        change = (r['mb_s'] / o['mb_s'] - 1) * 100 if o['mb_s'] else float('nan')
+        lines.append(f"{r['format']:>16} {r['size']:>7}  {o['mb_s']:9.1f} {r['mb_s']:9.1f} "
+                     f"{change:+7.1f}%  {o['peak_rss_mb'] or 0:8.1f} {r['peak_rss_mb'] or 0:8.1f}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.parse_benchmark',
+        description='Measure parser throughput and memory on synthetic captures of every '
+                    'supported format and write a JSON report that can be compared between commits.')
+    parser.add_argument('--formats', default='all',
+                        help=f"comma separated, from: {', '.join(FORMATS)} (default: all)")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help=f'comma separated file sizes, e.g. 1MB,2GB (default: {DEFAULT_SIZES})')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per case (default: 3)')
+    parser.add_argument('--data-dir', help='where generated files are kept and reused '
+                                           '(default: a directory in the system temp dir)')
+    parser.add_argument('-o', '--output', help='write the JSON report to this file')
+    parser.add_argument('--baseline', help='report to compare the new results against')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                        help='only compare two existing reports')
+    parser.add_argument('--run-case', nargs=2, metavar=('FORMAT', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_case:
+        print(json.dumps(run_case(*args.run_case)))
+        return 0
+    if args.compare:
+        old, new = (json.loads(Path(p).read_text(encoding='utf-8')) for p in args.compare)
+        print('\n'.join(compare_reports(old, new)))
+        return 0
+
+    formats = list(FORMATS) if args.formats == 'all' else args.formats.split(',')
+    unknown = [f for f in formats if f not in FORMATS]
+    if unknown:
+        parser.error(f"unknown formats: {', '.join(unknown)}")
+    sizes = [parse_size(s) for s in args.sizes.split(',')]
+
+    report = benchmark(formats, sizes, args.repeat, args.data_dir)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding='utf-8')
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        print('\n'.join(compare_reports(baseline, report)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
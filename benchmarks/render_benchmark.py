@@ -0,0 +1,213 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Render without a display unless one was asked for explicitly
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from .generators import BINARY_PARAMS, generate
+from .parse_benchmark import environment, format_size, parse_size
+
+DEFAULT_SIZE = '128MB'
+DEFAULT_MAX_POINTS = '1000,10000,100000'
+REPORT_VERSION = 1
+STAGES = ('decimate', 'update', 'paint', 'frame')
+
+
+def view_script(t_min, t_max, zoom_levels=12, pan_steps=20):
+    """
+    X ranges of a scripted session: zoom in 2x per frame towards the middle of the
+    capture, pan across at the deepest and a middle zoom level, then zoom back out.
+    """
+    span = t_max - t_min
+    center = t_min + span / 2
+    zoom_in = [(center - span / 2 ** (k + 1), center + span / 2 ** (k + 1))
+               for k in range(zoom_levels + 1)]
+    ranges = list(zoom_in)
+    for level in (zoom_levels, zoom_levels // 2):
+        width = span / 2 ** level
+        start = center - width / 2
+        ranges += [(start + i * width / 10, start + width + i * width / 10)
+                   for i in range(1, pan_steps + 1)]
+    ranges += zoom_in[-2::-1]
+    return ranges
+
+
+class StageTimes:
+    """Time accumulated per stage within the current frame."""
+
+    def __init__(self):
+        self.current = 0.0
+
+    @contextmanager
+    def wrap(self, owner, name):
+        """Add the time spent in ``owner.name`` while this is active."""
+        original = getattr(owner, name)
+
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.current += time.perf_counter() - started
+
+        setattr(owner, name, timed)
+        try:
+            yield
+        finally:
+            setattr(owner, name, original)
+
+
+def summarize(times):
+    """Milliseconds: median, 95th percentile and maximum."""
+    ordered = sorted(times)
+    return {
+        'median_ms': round(statistics.median(ordered) * 1e3, 3),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1e3, 3),
+        'max_ms': round(ordered[-1] * 1e3, 3),
+    }
+
+
+def run_frames(viewer, ranges, decimate_times):
+    """
+    Show each X range in turn and return the per-frame times of each stage: decimation,
+    ``update_plot`` as a whole (which includes decimation and updating the curve), the
+    synchronous repaint of the plot and the whole frame including the range change.
+    """
+    from PySide6.QtWidgets import QApplication
+
+    view_box = viewer.plot_widget.getViewBox()
+    viewport = viewer.plot_widget.viewport()
+    frames = {stage: [] for stage in STAGES}
+    for x_min, x_max in ranges:
+        decimate_times.current = 0.0
+        started = time.perf_counter()
+        view_box.setXRange(x_min, x_max, padding=0)
+        # Redraw right away instead of on the coalescing timer
+        viewer._redraw_timer.stop()
+        updating = time.perf_counter()
+        viewer.update_plot()
+        painting = time.perf_counter()
+        viewport.repaint()
+        finished = time.perf_counter()
+        QApplication.processEvents()
+        frames['decimate'].append(decimate_times.current)
+        frames['update'].append(painting - updating)
+        frames['paint'].append(finished - painting)
+        frames['frame'].append(finished - started)
+    return frames
+
+
+def benchmark(size, max_points_settings, data_dir=None, log=print):
+    """
+    Load a synthetic capture of about ``size`` bytes into an OscilloscopeViewer, play
+    the ``view_script`` once per Max Points setting and return the report.
+    """
+    import oscilloscope_viewer
+    from oscilloscope_core import MinMaxPyramid, load_binary_capture
+    from PySide6.QtWidgets import QApplication
+
+    data_dir = Path(data_dir or Path(tempfile.gettempdir()) / 'oscilloscope_viewer_bench')
+    path, _ = generate('binary', size, data_dir)
+    app = QApplication.instance() or QApplication([])
+
+    viewer = oscilloscope_viewer.OscilloscopeViewer()
+    # Decimate on the GUI thread so that every frame is measured from start to finish
+    viewer.background_decimation = False
+    viewer.show()
+    app.processEvents()
+
+    started = time.perf_counter()
+    viewer._on_capture_loaded(load_binary_capture(path, BINARY_PARAMS, channels=[1]))
+    load_s = time.perf_counter() - started
+    viewer.plot_widget.viewport().repaint()
+    app.processEvents()
+    x = viewer.time_axis()
+    ranges = view_script(float(x[0]), float(x[-1]))
+
+    decimate_times = StageTimes()
+    results = []
+    with decimate_times.wrap(oscilloscope_viewer, 'decimate_data'), \
+            decimate_times.wrap(MinMaxPyramid, 'decimate'):
+        for max_points in max_points_settings:
+            viewer.decimation_spinbox.setValue(max_points)
+            viewer.plot_widget.enableAutoRange()
+            app.processEvents()
+            frames = run_frames(viewer, ranges, decimate_times)
+            result = {'max_points': max_points, 'frames': len(ranges)}
+            result.update({stage: summarize(frames[stage]) for stage in STAGES})
+            result['fps'] = round(1 / statistics.median(frames['frame']), 1)
+            results.append(result)
+            log(f"max points {max_points:>9,}  frame {result['frame']['median_ms']:8.2f} ms "
+                f"(p95 {result['frame']['p95_ms']:8.2f})  decimate "
+                f"{result['decimate']['median_ms']:7.2f}  update {result['update']['median_ms']:7.2f}  "
+                f"paint {result['paint']['median_ms']:7.2f} ms")
+
+    viewer.close()
+    return {
+        'version': REPORT_VERSION,
+        'environment': environment(),
+        'capture': {'size': format_size(size), 'rows': len(viewer.raw_data),
+                    'load_s': round(load_s, 3)},
+        'window': [viewer.plot_widget.width(), viewer.plot_widget.height()],
+        'results': results,
+    }
+
+
+def compare_reports(old, new):
+    """Lines comparing the median and 95th percentile frame times of two reports."""
+    old_results = {r['max_points']: r for r in old['results']}
+    lines = [f"{'max points':>10}  {'stage':>8}  {'old med':>9} {'new med':>9} {'change':>8}  "
+             f"{'old p95':>9} {'new p95':>9}"]
+    for r in new['results']:
+        o = old_results.get(r['max_points'])
+        if o is None:
+            continue
+        for stage in STAGES:
+            old_ms, new_ms = o[stage]['median_ms'], r[stage]['median_ms']
+            change = (new_ms / old_ms - 1) * 100 if old_ms else float('nan')
+            lines.append(f"{r['max_points']:>10,}  {stage:>8}  {old_ms:9.2f} {new_ms:9.2f} "
+                         f"{change:+7.1f}%  {o[stage]['p95_ms']:9.2f} {r[stage]['p95_ms']:9.2f}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.render_benchmark',
+        description='Measure per-frame decimation, plot update and paint times of the viewer '
+                    'over a scripted sequence of zooms and pans, at several Max Points settings.')
+    parser.add_argument('--size', default=DEFAULT_SIZE,
+                        help=f'size of the synthetic 4-channel int16 capture (default: {DEFAULT_SIZE})')
+    parser.add_argument('--max-points', default=DEFAULT_MAX_POINTS,
+                        help=f'comma separated Max Points settings (default: {DEFAULT_MAX_POINTS})')
+    parser.add_argument('--data-dir', help='where generated files are kept and reused '
+                                           '(default: a directory in the system temp dir)')
+    parser.add_argument('-o', '--output', help='write the JSON report to this file')
+    parser.add_argument('--baseline', help='report to compare the new results against')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                        help='only compare two existing reports')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        old, new = (json.loads(Path(p).read_text(encoding='utf-8')) for p in args.compare)
+        print('\n'.join(compare_reports(old, new)))
+        return 0
+
+    max_points = [int(p) for p in args.max_points.split(',')]
+    report = benchmark(parse_size(args.size), max_points, args.data_dir)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding='utf-8')
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        print('\n'.join(compare_reports(baseline, report)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,9 @@
+from .binary import binary_np_dtype, detect_header_offset, parse_channel_list, read_binary_capture
+from .capture_cache import CaptureCache
+from .decimation import (BufferPool, GrowingOverview, MinMaxPyramid, UniformTimeAxis,
+                         build_pyramids, decimate_data, visible_slice)
+from .loading import (capture_time_axis, csv_cache_tag, load_binary_capture, load_capture,
+                      load_csv_capture, read_cached_capture, value_scaling, write_cached_capture)
+from .measure import time_measurement, voltage_measurement, waveform_statistics
+from .memory import (capture_memory, default_memory_budget, is_mapped, process_rss_bytes,
+                     resident_bytes)
@@ -0,0 +1,307 @@
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+def detect_header_offset(file_path: str, np_dtype: np.dtype, channel_count: int, channel_index: int, max_scan_bytes: int = 1 << 20) -> int:
+    """
+    Heuristic header detector: scans the first portion of the file in aligned steps
+    and returns the offset where the data appears least "random" based on low
+    transition density and low unique value fraction in a window.
+
+    The scan region is read once and the scores of all candidate offsets are computed
+    together: transitions from a running count, unique values from each sample's
+    previous occurrence of the same value.
+
+    Returns byte offset.
+    """
+    np_dtype = np.dtype(np_dtype)
+    channel_count = max(1, channel_count)
+    step = max(1, int(np_dtype.itemsize) * channel_count)
+    file_size = Path(file_path).stat().st_size
+    limit = min(max_scan_bytes, file_size)
+    items_per_window = 4096
+
+    # Candidate offsets hop by 8 samples worth; as sample (row) indices
+    offsets = np.arange(0, int(limit), step * 8)
+    if offsets.size == 0:
+        return 0
+    starts = offsets // step
+    total_items = file_size // np_dtype.itemsize
+    total_rows = total_items // channel_count
+
+    # Read every row any window can reach in one go
+    n = int(min(total_rows, starts[-1] + items_per_window))
+    with open(file_path, 'rb') as f:
+        raw = np.fromfile(f, dtype=np_dtype, count=n * channel_count)
+    n = raw.size // channel_count
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        arr = raw[:n * channel_count].reshape(n, channel_count)[:, channel_index].astype(np.float64)
+        changes = np.diff(arr) != 0
+
+    # Window at row s holds min(items_per_window, rows left) samples; windows with
+    # fewer than items_per_window raw items left in the file are skipped
+    lengths = np.minimum(items_per_window, total_rows - starts)
+    valid = (np.minimum(items_per_window * channel_count, total_items - starts * channel_count)
+             >= items_per_window) & (lengths >= 64)
+    starts, lengths = starts[valid], lengths[valid]
+    if starts.size == 0:
+        return 0
+
+    changes_before = np.concatenate(([0], np.cumsum(changes)))
+    transitions = changes_before[starts + lengths - 1] - changes_before[starts]
+
+    # prev[i]: index of the previous sample with the same value (NaNs compare equal)
+    _, ids = np.unique(arr, return_inverse=True)
+    ids = ids.ravel()
+    order = np.argsort(ids, kind='stable')
+    same = ids[order[1:]] == ids[order[:-1]]
+    prev = np.full(n, -1)
+    prev[order[1:][same]] = order[:-1][same]
+    # Sample i is the first of its value in window [s, s + length) for prev[i] < s <= i;
+    # count per s with difference arrays, for full windows and for those reaching EOF
+    idx = np.arange(n)
+    first_full = np.maximum(prev + 1, idx - items_per_window + 1)
+    unique_full = np.cumsum(np.bincount(first_full, minlength=n + 1)
+                            - np.bincount(idx + 1, minlength=n + 1))
+    unique_tail = np.cumsum(np.bincount(prev + 1, minlength=n + 1)
+                            - np.bincount(idx + 1, minlength=n + 1))
+    unique = np.where(lengths == items_per_window, unique_full[starts], unique_tail[starts])
+
+    # Favor fewer transitions and fewer unique values (plateaus)
+    scores = transitions / lengths + 0.75 * (unique / lengths)
+    return int(offsets[valid][np.argmin(scores)])
+
+
+def parse_channel_list(text: str):
+    """
+    Parse a 1-based channel selection like "1,3-4" into a sorted list of channel
+    numbers. Empty text (or "all") selects every channel and returns None.
+    """
+    text = text.strip().lower()
+    if text in ('', 'all'):
+        return None
+    channels = set()
+    for part in text.replace(' ', '').split(','):
+        if not part:
+            continue
+        try:
+            if '-' in part:
+                first, last = (int(v) for v in part.split('-', 1))
+                channels.update(range(first, last + 1))
+            else:
+                channels.add(int(part))
+        except ValueError:
+            raise ValueError(f"Invalid channel selection: {part!r}")
+    return sorted(channels) or None
+
+
+def binary_np_dtype(endian: str, dtype_name: str) -> np.dtype:
+    """Map the BinaryImportDialog endianness/data type names to a numpy dtype."""
+    endian_char = '<' if endian.lower().startswith('l') else '>'
+    dtype_map = {
+        'int8': 'i1', 'uint8': 'u1',
+        'int16': 'i2', 'uint16': 'u2',
+        'int32': 'i4', 'uint32': 'u4',
+        'float32': 'f4', 'float64': 'f8',
+    }
+    base = dtype_map.get(dtype_name)
+    if base is None:
+        raise ValueError(f"Unsupported data type: {dtype_name}")
+    return np.dtype(endian_char + base)
+
+
+def read_binary_capture(file_name, params, progress_callback=None, cancel_token=None):
+    """
+    Read an interleaved raw binary capture described by ``BinaryImportDialog.get_params()``.
+
+    Returns (metadata, data_frame) like the CSV parsers. Safe to call from a worker
+    thread; ``cancel_token`` is checked between the processing steps.
+    """
+    def report(current, message):
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        if progress_callback:
+            progress_callback(current, 100, message)
+
+    # Validate params
+    if params["sample_rate_hz"] <= 0:
+        raise ValueError("Sample rate must be > 0")
+
+    np_dtype = binary_np_dtype(params['endian'], params['dtype'])
+    ch_count = max(1, int(params['channel_count']))
+
+    # Channels to load (1-based); the others are skipped while reading
+    channels = sorted(set(params.get('channels') or range(1, ch_count + 1)))
+    if channels[0] < 1 or channels[-1] > ch_count:
+        raise ValueError(f"Channels must be between 1 and {ch_count}")
+
+    # Optionally auto-detect header on load
+    if params.get("auto_detect"):
+        report(0, "Detecting header...")
+        try:
+            ch_index = int(params['channel_index'])
+            auto_offset = detect_header_offset(file_name, np_dtype, ch_count, ch_index)
+            params = dict(params, offset_bytes=int(auto_offset))
+        except Exception:
+            # Fall back to user-provided offset if detection fails
+            pass
+
+    offset = int(params['offset_bytes'])
+    length_bytes = int(params['length_bytes'])
+
+    # Align offset to sample boundary (dtype size * channel_count)
+    sample_bytes = np_dtype.itemsize * ch_count
+
+    # Determine effective offset/length with optional points-per-channel mode
+    file_size = Path(file_name).stat().st_size
+    use_points = bool(params.get('use_points'))
+    points_per_channel = int(params.get('points_per_channel', 0))
+    if use_points and points_per_channel > 0:
+        desired_bytes = points_per_channel * sample_bytes
+        eff_offset = max(0, file_size - desired_bytes)
+        eff_offset = (eff_offset // sample_bytes) * sample_bytes  # align down
+        # Limit length to desired bytes but not beyond file end
+        eff_length_bytes = min(desired_bytes, max(0, file_size - eff_offset))
+    else:
+        eff_offset = ((int(offset) + sample_bytes - 1) // sample_bytes) * sample_bytes
+        # Adjust length if provided to account for alignment shift
+        if length_bytes > 0:
+            align_delta = max(0, eff_offset - offset)
+            eff_length_bytes = max(0, length_bytes - align_delta)
+        else:
+            eff_length_bytes = 0
+
+    report(5, "Reading file...")
+
+    # Determine number of items to read
+    if eff_length_bytes > 0:
+        count = eff_length_bytes // np_dtype.itemsize
+    else:
+        # Compute remaining bytes to end of file
+        remaining_bytes = max(0, file_size - eff_offset)
+        count = remaining_bytes // np_dtype.itemsize
+
+    sr = float(params['sample_rate_hz'])
+    scale = float(params['scale_v_per_unit'])
+    voffset = float(params['v_offset'])
+    memory_map = bool(params.get('memory_map'))
+    storage = 'native' if memory_map else params.get('storage_dtype', 'float64')
+
+    if memory_map:
+        # Zero-copy: each channel is a strided view of the mapped file, in the file's
+        # own dtype. The time axis and scaling are computed on demand by the viewer.
+        total_samples = count // ch_count
+        if total_samples == 0:
+            raise ValueError("No data samples found with the given settings")
+        report(30, "Mapping file...")
+        mapped = np.memmap(file_name, dtype=np_dtype, mode='r', offset=eff_offset,
+                           shape=(total_samples, ch_count))
+        df_dict = {f'Value_CH{ch}': mapped[:, ch - 1] for ch in channels}
+        df_dict['Value'] = df_dict[f'Value_CH{1 if 1 in channels else channels[0]}']
+        df = pd.DataFrame(df_dict, copy=False)
+    else:
+        df = _read_binary_frame(file_name, np_dtype, eff_offset, count, ch_count,
+                                sr, scale, voffset, report, storage, channels)
+
+    # Metadata
+    metadata = {
+        'format': 'Binary',
+        'Horizontal Units': ['s'],
+        'Vertical Units': ['V'],
+        'Sample Rate (Hz)': [sr],
+        'Endian': [params['endian']],
+        'Data Type': [params['dtype']],
+        'Requested Header Offset (bytes)': [offset],
+        'Effective Header Offset (bytes)': [eff_offset],
+        'Header Alignment (bytes)': [sample_bytes],
+        'Data Length (bytes)': [
+            eff_length_bytes if eff_length_bytes > 0 else (file_size - eff_offset)
+        ],
+    }
+    if memory_map:
+        metadata['Memory Mapped'] = ['True']
+    if memory_map or storage == 'native':
+        metadata['Value Scale'] = [scale]
+        metadata['Value Offset'] = [voffset]
+
+    # Record points-per-channel mode
+    metadata['Using Points Mode'] = [str(use_points)]
+    if use_points:
+        metadata['Points per Channel (requested)'] = [points_per_channel]
+
+    # Save channels metadata for UI selection
+    metadata['Channels'] = channels
+    metadata['Available Channels'] = list(range(1, ch_count + 1))
+
+    return metadata, df
+
+
+def _read_binary_frame(file_name, np_dtype, eff_offset, count, ch_count, sr, scale, voffset,
+                       report, storage='float64', channels=None, block_rows=1 << 20):
+    """
+    Read ``count`` items into memory and build the 'Second'/'Value_CHn' frame.
+
+    ``storage`` is 'float64' or 'float32' for scaled values, or 'native' to keep the
+    samples in the file's dtype (byte-swapped to native order) with scaling left to
+    the caller. The compact modes also leave out the 'Second' column, which the viewer
+    derives from the sample rate (see UniformTimeAxis).
+
+    Only the 1-based ``channels`` (default: all) are kept. The file is read in blocks
+    of ``block_rows`` samples and the selected channels are copied straight out of
+    each interleaved block into their own columns, so memory use is proportional to
+    the channels loaded rather than the whole file.
+    """
+    channels = list(channels or range(1, ch_count + 1))
+    total_samples = count // ch_count
+    if count == 0:
+        raise ValueError("No data samples found with the given settings")
+    if total_samples == 0:
+        raise ValueError("Not enough data for the specified channel count")
+
+    out_dtype = np_dtype.newbyteorder('=') if storage == 'native' else np.dtype(storage)
+    columns = {ch: np.empty(total_samples, dtype=out_dtype) for ch in channels}
+    with open(file_name, 'rb') as f:
+        if eff_offset:
+            f.seek(eff_offset, 0)
+        position = 0
+        while position < total_samples:
+            rows = min(block_rows, total_samples - position)
+            block = np.fromfile(f, dtype=np_dtype, count=rows * ch_count)
+            rows = block.size // ch_count
+            if rows == 0:
+                break
+            block = block[:rows * ch_count].reshape(rows, ch_count)
+            for ch, column in columns.items():
+                column[position:position + rows] = block[:, ch - 1]
+            position += rows
+            report(5 + int(55 * position / total_samples), "Reading channels...")
+
+    if position < total_samples:
+        # File shorter than expected
+        columns = {ch: column[:position] for ch, column in columns.items()}
+        total_samples = position
+
+    report(60, "Building time axis...")
+
+    t = np.arange(total_samples, dtype=np.float64) / sr if storage == 'float64' else None
+
+    # Apply scaling (same scale/offset for all channels)
+    if storage != 'native':
+        for column in columns.values():
+            column *= scale
+            column += voffset
+
+    report(80, "Creating DataFrame...")
+
+    # Build DataFrame with one column per channel and a primary 'Value' column
+    df_dict = {'Second': t} if t is not None else {}
+    for ch, column in columns.items():
+        df_dict[f'Value_CH{ch}'] = column
+    # Prefer CH1 as primary Value if available
+    primary_ch = 1 if 1 in columns else channels[0]
+    df_dict['Value'] = df_dict[f'Value_CH{primary_ch}']
+    return pd.DataFrame(df_dict, copy=False)
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+# Bump when the on-disk layout changes so old entries are ignored
+CACHE_FORMAT_VERSION = 2
+DEFAULT_BUDGET_BYTES = 4 << 30
+
+
+def default_cache_dir() -> Path:
+    """Cache location: $OSCILLOSCOPE_VIEWER_CACHE_DIR, else the per-user cache directory."""
+    env_dir = os.environ.get('OSCILLOSCOPE_VIEWER_CACHE_DIR')
+    if env_dir:
+        return Path(env_dir)
+    base = os.environ.get('XDG_CACHE_HOME') or os.environ.get('LOCALAPPDATA')
+    base_dir = Path(base) if base else Path.home() / '.cache'
+    return base_dir / 'oscilloscope_viewer'
+
+
+def default_budget_bytes() -> int:
+    """Disk budget: $OSCILLOSCOPE_VIEWER_CACHE_MB (0 disables the cache), else 4 GiB."""
+    env_mb = os.environ.get('OSCILLOSCOPE_VIEWER_CACHE_MB')
+    if env_mb:
+        try:
+            return max(0, int(float(env_mb) * (1 << 20)))
+        except ValueError:
+            pass
+    return DEFAULT_BUDGET_BYTES
+
+
+class CaptureCache:
+    """
+    On-disk cache of parsed captures.
+
+    Each entry is a directory holding one ``.npy`` file per array (columns, pyramid
+    levels, ...) plus an ``index.json`` with the metadata. Entries are keyed by the
+    source file's resolved path, size and mtime together with a caller supplied tag
+    (parser name and version), so editing the file or changing the parser invalidates
+    them. Arrays are returned memory-mapped, which makes re-opening a capture cost
+    roughly the time to read the index.
+
+    The total size is kept under ``budget_bytes`` by evicting least recently used
+    entries after every store.
+    """
+    def __init__(self, cache_dir=None, budget_bytes=None):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+        self.budget_bytes = default_budget_bytes() if budget_bytes is None else int(budget_bytes)
+
+    @property
+    def enabled(self) -> bool:
+        return self.budget_bytes > 0
+
+    def _identity(self, file_path, tag):
+        st = Path(file_path).stat()
+        ident = {
+            'path': str(Path(file_path).resolve()),
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'tag': str(tag),
+            'format': CACHE_FORMAT_VERSION,
+        }
+        key = hashlib.sha1(json.dumps(ident, sort_keys=True).encode('utf-8')).hexdigest()
+        return key, ident
+
+    def load(self, file_path, tag):
+        """
+        Return (metadata, arrays) for a cached capture, or None on a miss.
+
+        ``arrays`` maps the names passed to ``store`` to read-only memory-mapped arrays.
+        """
+        if not self.enabled:
+            return None
+        try:
+            key, ident = self._identity(file_path, tag)
+            entry = self.cache_dir / key
+            index_path = entry / 'index.json'
+            info = json.loads(index_path.read_text(encoding='utf-8'))
+            if info.get('ident') != ident:
+                return None
+            arrays = {
+                name: np.load(entry / file_name, mmap_mode='r', allow_pickle=False)
+                for name, file_name in info['arrays']
+            }
+            # Mark as recently used for LRU eviction
+            os.utime(index_path)
+        except (OSError, ValueError, KeyError):
+            return None
+        return info['metadata'], arrays
+
+    def store(self, file_path, tag, metadata, arrays):
+        """
+        Write a capture to the cache and evict old entries to stay within budget.
+
+        ``arrays`` is an ordered mapping of name -> numpy array. Returns False when the
+        entry could not be written (e.g. the disk is full); the cache is best effort.
+        """
+        if not self.enabled or sum(arr.nbytes for arr in arrays.values()) > self.budget_bytes:
+            return False
+        key, ident = self._identity(file_path, tag)
+        entry = self.cache_dir / key
+        tmp = self.cache_dir / f'{key}.tmp-{os.getpid()}'
+        try:
+            shutil.rmtree(tmp, ignore_errors=True)
+            tmp.mkdir(parents=True)
+            names = []
+            for i, (name, arr) in enumerate(arrays.items()):
+                file_name = f'{i}.npy'
+                np.save(tmp / file_name, np.ascontiguousarray(arr), allow_pickle=False)
+                names.append([name, file_name])
+            info = {'ident': ident, 'metadata': metadata, 'arrays': names}
+            (tmp / 'index.json').write_text(json.dumps(info, default=str), encoding='utf-8')
+            shutil.rmtree(entry, ignore_errors=True)
+            os.replace(tmp, entry)
+        except (OSError, TypeError, ValueError):
+            shutil.rmtree(tmp, ignore_errors=True)
+            return False
+        self.evict(keep=key)
+        return True
+
+    def entries(self):
+        """Return [(last_used, size_bytes, path)] for all complete entries, oldest first."""
+        result = []
+        if not self.cache_dir.is_dir():
+            return result
+        for entry in self.cache_dir.iterdir():
+            index_path = entry / 'index.json'
+            try:
+                last_used = index_path.stat().st_mtime
+                size = sum(p.stat().st_size for p in entry.iterdir())
+            except OSError:
+                continue
+            result.append((last_used, size, entry))
+        result.sort()
+        return result
+
+    def total_bytes(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, keep=None):
+        """Delete least recently used entries until the cache fits its budget."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.budget_bytes:
+                break
+            if entry.name == keep:
+                continue
+            try:
+                shutil.rmtree(entry)
+            except OSError:
+                # Still mapped by another process on some platforms; try next time
+                continue
+            total -= size
+
+    def clear(self):
+        for _, _, entry in self.entries():
+            shutil.rmtree(entry, ignore_errors=True)
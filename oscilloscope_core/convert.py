@@ -0,0 +1,277 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from parsers import PARSER_REGISTRY
+
+from .binary import parse_channel_list
+from .loading import capture_time_axis, load_binary_capture, load_csv_capture
+
+OUTPUT_FORMATS = ('npz', 'parquet')
+# Key of the capture metadata (JSON) in converted files
+METADATA_KEY = 'oscilloscope_viewer.metadata'
+
+
+def write_npz(path, metadata, data, compress=False):
+    """Write one array per column plus the metadata as JSON under METADATA_KEY."""
+    arrays = {col: np.asarray(data[col].values) for col in data.columns}
+    arrays[METADATA_KEY] = np.array(json.dumps(metadata, default=str))
+    (np.savez_compressed if compress else np.savez)(path, **arrays)
+
+
+def write_parquet(path, metadata, data, compress=False):
+    """Write the columns with pyarrow, the metadata as JSON in the schema metadata."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    schema_metadata = dict(table.schema.metadata or {})
+    schema_metadata[METADATA_KEY.encode()] = json.dumps(metadata, default=str).encode()
+    table = table.replace_schema_metadata(schema_metadata)
+    pq.write_table(table, path, compression='zstd' if compress else 'none')
+
+
+def read_converted(path):
+    """Return (metadata, data) of a file written by ``convert_capture``."""
+    path = Path(path)
+    if path.suffix == '.parquet':
+        import pyarrow.parquet as pq
+        table = pq.read_table(path)
+        metadata = json.loads((table.schema.metadata or {}).get(METADATA_KEY.encode(), b'{}'))
+        return metadata, table.to_pandas()
+    with np.load(path, allow_pickle=False) as npz:
+        metadata = json.loads(str(npz[METADATA_KEY])) if METADATA_KEY in npz.files else {}
+        data = pd.DataFrame({name: npz[name] for name in npz.files if name != METADATA_KEY},
+                            copy=False)
+    return metadata, data
+
+
+def convert_capture(file_name, out_path, fmt='npz', binary_params=None, channels=None,
+                    compress=False):
+    """
+    Load one capture (a CSV file in any supported format, or raw binary described by
+    ``binary_params``) and write it to ``out_path`` as ``fmt``.
+
+    The output always has a 'Second' column, also for captures whose time axis is
+    otherwise computed from the sample rate (raw binary), so it can be read by tools
+    that know nothing about the metadata.
+
+    Returns a summary dict with the row count, columns, sizes and timings.
+    """
+    started = time.perf_counter()
+    if binary_params is not None:
+        kind = 'Binary'
+        metadata, data, _ = load_binary_capture(file_name, binary_params, channels=channels,
+                                                pyramids=False)
+    else:
+        parser, head = PARSER_REGISTRY.sniff(file_name)
+        kind = parser.__class__.__name__.replace('CSVParser', '') if parser else None
+        metadata, data, _ = load_csv_capture(file_name, channels=channels, parser=parser,
+                                             head=head, pyramids=False)
+    if 'Second' not in data.columns:
+        data.insert(0, 'Second', capture_time_axis(metadata, data)[:])
+    parsed = time.perf_counter()
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    # Write next to the target and rename, so an interrupted run leaves no partial file
+    tmp_path = out_path.with_name(f'.{out_path.stem}.tmp-{os.getpid()}{out_path.suffix}')
+    try:
+        (write_parquet if fmt == 'parquet' else write_npz)(tmp_path, metadata, data, compress)
+        os.replace(tmp_path, out_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    finished = time.perf_counter()
+
+    input_bytes = Path(file_name).stat().st_size
+    return {
+        'input': str(file_name),
+        'output': str(out_path),
+        'format': kind,
+        'rows': len(data),
+        'columns': list(data.columns),
+        'input_bytes': input_bytes,
+        'output_bytes': out_path.stat().st_size,
+        'parse_seconds': round(parsed - started, 3),
+        'write_seconds': round(finished - parsed, 3),
+        'throughput_mb_s': round(input_bytes / max(finished - started, 1e-9) / 1e6, 1),
+    }
+
+
+def _convert_job(job):
+    """Worker process entry point: convert, turning errors into a result."""
+    file_name, out_path, fmt, binary_params, channels, compress = job
+    try:
+        return convert_capture(file_name, out_path, fmt, binary_params, channels, compress)
+    except Exception as e:
+        return {'input': str(file_name), 'error': f'{e.__class__.__name__}: {e}'}
+
+
+def find_inputs(paths, pattern, recursive=False):
+    """
+    Return [(file, path relative to the directory it was found in)] for files and directories.
+
+    Files found in a directory keep that directory's name in front of their relative
+    path, so equally named files from different directories do not map to the same
+    output. Converted files (OUTPUT_FORMATS suffixes) are skipped, e.g. outputs
+    written next to their inputs by an earlier run.
+    """
+    found = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            root = Path(path.resolve().name)
+            matches = path.rglob(pattern) if recursive else path.glob(pattern)
+            found.extend((f, root / f.relative_to(path)) for f in sorted(matches)
+                         if f.is_file() and f.suffix.lstrip('.') not in OUTPUT_FORMATS)
+        else:
+            found.append((path, Path(path.name)))
+    return found
+
+
+def output_path(relative, output_dir, source, fmt):
+    """Converted file name: the input's name with the format's suffix, in ``output_dir``
+    (below the scanned directory's name, keeping the layout within it) or next to the input."""
+    base = Path(output_dir) / relative if output_dir else source
+    return base.with_name(base.name + '.' + fmt)
+
+
+def binary_params_from_args(args):
+    """Settings in the form of ``BinaryImportDialog.get_params()``."""
+    return {
+        'endian': args.endian,
+        'dtype': args.dtype,
+        'offset_bytes': args.offset_bytes,
+        'length_bytes': args.length_bytes,
+        'sample_rate_hz': args.sample_rate,
+        'scale_v_per_unit': args.scale,
+        'v_offset': args.v_offset,
+        'channel_count': args.channel_count,
+        'channel_index': 0,
+        'auto_detect': args.auto_detect,
+        'memory_map': False,
+        'storage_dtype': args.storage,
+        'use_points': False,
+        'points_per_channel': 0,
+    }
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m oscilloscope_core.convert',
+        description='Convert oscilloscope captures (any supported CSV format, or raw binary '
+                    'with --binary) to npz or parquet files, in parallel.')
+    parser.add_argument('inputs', nargs='+', help='capture files and/or directories')
+    parser.add_argument('-o', '--output-dir', help='where to write (default: next to each input)')
+    parser.add_argument('-f', '--format', choices=OUTPUT_FORMATS, default='npz',
+                        help='output format (parquet needs pyarrow; default: npz)')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help='worker processes (default: CPU count)')
+    parser.add_argument('-r', '--recursive', action='store_true', help='search directories recursively')
+    parser.add_argument('--pattern', help="file name pattern in directories (default: '*.csv', "
+                                          "or '*' with --binary)")
+    parser.add_argument('--channels', help='channels to convert, e.g. 1,3-4 (default: all)')
+    parser.add_argument('--float32', action='store_true', help='store CSV values as float32')
+    parser.add_argument('--compress', action='store_true', help='compress the output')
+    parser.add_argument('--skip-existing', action='store_true',
+                        help='skip inputs whose output is newer than the input')
+    parser.add_argument('--summary', help='write a JSON summary of all conversions to this file')
+
+    binary = parser.add_argument_group('raw binary input')
+    binary.add_argument('--binary', action='store_true', help='treat the inputs as raw binary')
+    binary.add_argument('--dtype', default='int16',
+                        choices=['int8', 'uint8', 'int16', 'uint16', 'int32', 'uint32',
+                                 'float32', 'float64'])
+    binary.add_argument('--endian', default='Little', type=str.capitalize, choices=['Little', 'Big'])
+    binary.add_argument('--channel-count', type=int, default=1, help='interleaved channels')
+    binary.add_argument('--sample-rate', type=float, default=1_000_000.0, help='in Hz')
+    binary.add_argument('--offset-bytes', type=int, default=0, help='header size')
+    binary.add_argument('--length-bytes', type=int, default=0, help='data length (0: to end)')
+    binary.add_argument('--scale', type=float, default=1.0, help='V per unit')
+    binary.add_argument('--v-offset', type=float, default=0.0, help='offset in V')
+    binary.add_argument('--auto-detect', action='store_true', help='detect the header size')
+    binary.add_argument('--storage', default='float64', choices=['float64', 'float32', 'native'])
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    if args.format == 'parquet':
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            print("error: --format parquet needs pyarrow (pip install pyarrow)", file=sys.stderr)
+            return 2
+    try:
+        channels = parse_channel_list(args.channels or '')
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    binary_params = binary_params_from_args(args) if args.binary else None
+    pattern = args.pattern or ('*' if args.binary else '*.csv')
+
+    jobs = []
+    targets = {}
+    for source, relative in find_inputs(args.inputs, pattern, args.recursive):
+        target = output_path(relative, args.output_dir, source, args.format)
+        key = target.resolve()
+        if key in targets:
+            print(f"error: {source} and {targets[key]} would both be converted to {target}",
+                  file=sys.stderr)
+            return 2
+        targets[key] = source
+        if (args.skip_existing and target.exists()
+                and target.stat().st_mtime >= source.stat().st_mtime):
+            continue
+        jobs.append((str(source), str(target), args.format, binary_params, channels, args.compress))
+    if not jobs:
+        print("Nothing to convert")
+        return 0
+
+    # Worker processes inherit these; with several files at once, parallelism comes
+    # from the pool rather than from threads within one file
+    if args.float32:
+        os.environ['OSCILLOSCOPE_VIEWER_STORAGE_DTYPE'] = 'float32'
+    workers = max(1, min(args.jobs, len(jobs)))
+    if workers > 1:
+        os.environ.setdefault('OSCILLOSCOPE_VIEWER_PARSE_WORKERS', '1')
+
+    started = time.perf_counter()
+    results = []
+    if workers == 1:
+        finished = map(_convert_job, jobs)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        finished = (future.result() for future in
+                    as_completed([pool.submit(_convert_job, job) for job in jobs]))
+    try:
+        for result in finished:
+            results.append(result)
+            if 'error' in result:
+                print(f"FAILED {result['input']}: {result['error']}", file=sys.stderr)
+            else:
+                print(f"ok     {result['input']} -> {result['output']} "
+                      f"({result['format']}, {result['rows']:,} rows, {result['throughput_mb_s']} MB/s)")
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    elapsed = time.perf_counter() - started
+
+    failed = sum('error' in r for r in results)
+    input_bytes = sum(r.get('input_bytes', 0) for r in results)
+    print(f"{len(results) - failed} converted, {failed} failed, {input_bytes / 1e6:,.1f} MB "
+          f"in {elapsed:.1f} s ({input_bytes / max(elapsed, 1e-9) / 1e6:.1f} MB/s, {workers} workers)")
+    if args.summary:
+        Path(args.summary).write_text(json.dumps(results, indent=2), encoding='utf-8')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
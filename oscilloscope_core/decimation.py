@@ -0,0 +1,297 @@
+import threading
+
+import numpy as np
+
+
+def visible_slice(x, x_min, x_max, margin=0.1):
+    """
+    Return (start, stop) indices of the samples of a monotonic time axis that fall
+    inside [x_min, x_max], widened by ``margin`` times the visible width on each side.
+
+    Uses binary search, so the cost is O(log N) regardless of the capture length.
+    """
+    n = len(x)
+    if n == 0:
+        return 0, 0
+    pad = (x_max - x_min) * margin
+    start = int(np.searchsorted(x, x_min - pad, side='left'))
+    stop = int(np.searchsorted(x, x_max + pad, side='right'))
+    # Include one sample beyond each edge so the trace reaches the view border
+    return max(0, start - 1), min(n, stop + 1)
+
+
+class UniformTimeAxis:
+    """
+    Time axis of a capture with a constant sample rate, computed on demand.
+
+    Stands in for a float64 'Second' column (``len``, slicing, integer and index array
+    access and ``searchsorted``) without storing 8 bytes per sample, which matters for
+    memory-mapped captures that may not fit in RAM.
+    """
+    dtype = np.dtype(np.float64)
+
+    def __init__(self, length, sample_rate, start=0.0):
+        self.length = int(length)
+        self.sample_rate = float(sample_rate)
+        self.start = float(start)
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            index = np.arange(*index.indices(self.length))
+        elif np.ndim(index) == 0:
+            index = int(index)
+            if index < 0:
+                index += self.length
+            if not 0 <= index < self.length:
+                raise IndexError("time axis index out of range")
+            return self.start + index / self.sample_rate
+        else:
+            index = np.asarray(index)
+        return self.start + index / self.sample_rate
+
+    def searchsorted(self, v, side='left', sorter=None):
+        # Also reached through np.searchsorted(axis, v)
+        v = np.asarray(v, dtype=np.float64)
+        pos = (v - self.start) * self.sample_rate
+        idx = np.clip(np.ceil(pos) if side == 'left' else np.floor(pos) + 1, 0, self.length)
+        idx = idx.astype(np.intp)
+        # Nudge by one sample where rounding disagrees with the computed times
+        def before(i):
+            t = self.start + i / self.sample_rate
+            return t < v if side == 'left' else t <= v
+        idx = np.where((idx > 0) & ~before(idx - 1), idx - 1, idx)
+        idx = np.where((idx < self.length) & before(idx), idx + 1, idx)
+        return idx
+
+
+def _output_arrays(out, size, x_dtype, y_dtype):
+    """Return (x, y) result arrays of ``size``, as views of the ``out`` buffers when they fit."""
+    if out is not None:
+        x_buf, y_buf = out
+        if (len(x_buf) >= size and len(y_buf) >= size
+                and x_buf.dtype == x_dtype and y_buf.dtype == y_dtype):
+            return x_buf[:size], y_buf[:size]
+    return np.empty(size, dtype=x_dtype), np.empty(size, dtype=y_dtype)
+
+
+def decimate_data(x, y, max_points=10000, out=None):
+    """
+    Reduce number of points using min-max decimation to preserve signal features
+
+    ``out`` may be an (x, y) pair of preallocated buffers; the result is then written
+    into them and returned as views instead of allocating new arrays.
+    """
+    if len(x) <= max_points:
+        return x, y
+        
+    # Calculate the decimation factor
+    decimation_factor = len(x) // (max_points // 2)
+    
+    # Reshape the data to perform min-max decimation
+    n_chunks = len(x) // decimation_factor
+    x_reshaped = x[:n_chunks * decimation_factor].reshape(-1, decimation_factor)
+    y_reshaped = y[:n_chunks * decimation_factor].reshape(-1, decimation_factor)
+    
+    # Take first point of each chunk for x, interleaved with min and max values
+    x_decimated = x_reshaped[:, 0]
+    x_final, y_final = _output_arrays(out, 2 * n_chunks, x_decimated.dtype, y.dtype)
+    x_final[0::2] = x_decimated
+    x_final[1::2] = x_decimated
+    y_reshaped.min(axis=1, out=y_final[0::2])
+    y_reshaped.max(axis=1, out=y_final[1::2])
+    
+    return x_final, y_final
+
+
+class MinMaxPyramid:
+    """
+    Precomputed min/max envelopes of one channel at successively 2x coarser levels.
+
+    Level 0 holds one (min, max) pair per ``min_factor`` samples, each further level
+    halves the bucket count. Redraws pick the coarsest level that still satisfies the
+    requested point budget, so their cost depends on the screen size, not on the
+    capture length. Total overhead is at most ``4 / min_factor`` of the channel size
+    and is additionally capped by ``max_bytes``.
+    """
+    def __init__(self, levels):
+        # List of (factor, mins, maxs), finest level first
+        self.levels = levels
+
+    @classmethod
+    def build(cls, y, min_factor=16, max_bytes=256 << 20, min_buckets=1024,
+              block_buckets=1 << 16, cancel_token=None):
+        """
+        Build the levels for ``y``.
+
+        Level 0 is reduced ``block_buckets`` buckets at a time so that memory-mapped
+        channels are streamed from disk rather than paged in all at once, and so that
+        ``cancel_token`` can abort between blocks.
+        """
+        n = len(y)
+        factor = max(2, int(min_factor))
+        # Coarsen the base level until the whole pyramid (~2x level 0) fits the budget
+        while max_bytes and factor < n and 4 * (n // factor) * y.dtype.itemsize > max_bytes:
+            factor *= 2
+        levels = []
+        if n < 2 * factor:
+            return cls(levels)
+        block = factor * block_buckets
+        starts = np.arange(0, block, factor)
+        mins = np.empty(-(-n // factor), dtype=y.dtype)
+        maxs = np.empty_like(mins)
+        for first in range(0, n, block):
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            chunk = y[first:first + block]
+            b0 = first // factor
+            b1 = b0 + -(-len(chunk) // factor)
+            np.minimum.reduceat(chunk, starts[:b1 - b0], out=mins[b0:b1])
+            np.maximum.reduceat(chunk, starts[:b1 - b0], out=maxs[b0:b1])
+        levels.append((factor, mins, maxs))
+        while len(mins) > min_buckets:
+            pairs = np.arange(0, len(mins), 2)
+            mins = np.minimum.reduceat(mins, pairs)
+            maxs = np.maximum.reduceat(maxs, pairs)
+            factor *= 2
+            levels.append((factor, mins, maxs))
+        return cls(levels)
+
+    @property
+    def nbytes(self):
+        return sum(mins.nbytes + maxs.nbytes for _, mins, maxs in self.levels)
+
+    def to_arrays(self, prefix=''):
+        """Flatten the levels into {name: array} for storage (see ``from_arrays``)."""
+        arrays = {}
+        for factor, mins, maxs in self.levels:
+            arrays[f'{prefix}{factor}/min'] = mins
+            arrays[f'{prefix}{factor}/max'] = maxs
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix=''):
+        factors = sorted(int(name[len(prefix):].split('/')[0])
+                         for name in arrays if name.startswith(prefix) and name.endswith('/min'))
+        return cls([(f, arrays[f'{prefix}{f}/min'], arrays[f'{prefix}{f}/max']) for f in factors])
+
+    def decimate(self, x, start, stop, max_points=10000, out=None):
+        """
+        Min/max decimate samples [start, stop) using the precomputed levels.
+
+        Returns (x, y) like ``decimate_data`` (including its ``out`` buffers) or None
+        when the requested resolution is finer than the finest level, in which case the
+        caller should decimate the raw samples directly.
+        """
+        buckets = max(1, max_points // 2)
+        wanted = (stop - start) // buckets
+        usable = [lvl for lvl in self.levels if lvl[0] <= wanted]
+        if not usable:
+            return None
+        factor, mins, maxs = usable[-1]
+
+        # Level buckets overlapping [start, stop), regrouped to stay within the budget
+        b0 = start // factor
+        b1 = -(-stop // factor)
+        group = max(1, wanted // factor)
+        groups = np.arange(0, b1 - b0, group)
+        x_decimated = x[b0 * factor:b1 * factor:factor * group]
+
+        x_final, y_final = _output_arrays(out, 2 * len(groups), x_decimated.dtype, mins.dtype)
+        x_final[0::2] = x_decimated
+        x_final[1::2] = x_decimated
+        np.minimum.reduceat(mins[b0:b1], groups, out=y_final[0::2])
+        np.maximum.reduceat(maxs[b0:b1], groups, out=y_final[1::2])
+        return x_final, y_final
+
+
+class GrowingOverview:
+    """
+    Min/max overview of a trace that is still being appended to, e.g. while a file loads.
+
+    Keeps at most ``max_points`` points: whenever the buckets overflow, neighbouring
+    buckets are merged and the bucket size doubles, so memory use and drawing cost stay
+    constant however long the trace grows.
+    """
+    def __init__(self, max_points=10000):
+        self.max_buckets = max(1, max_points // 2)
+        self.factor = 1  # Samples per bucket for newly appended data
+        self.samples = 0
+        self.x = np.empty(0)
+        self.mins = np.empty(0)
+        self.maxs = np.empty(0)
+        # Samples not yet filling a whole bucket
+        self._tail_x = np.empty(0)
+        self._tail_y = np.empty(0)
+
+    def append(self, x, y):
+        self.samples += len(y)
+        x = np.concatenate((self._tail_x, x))
+        y = np.concatenate((self._tail_y, y))
+        full = len(y) - len(y) % self.factor
+        if full:
+            y_reshaped = y[:full].reshape(-1, self.factor)
+            self.x = np.concatenate((self.x, x[:full:self.factor]))
+            self.mins = np.concatenate((self.mins, y_reshaped.min(axis=1)))
+            self.maxs = np.concatenate((self.maxs, y_reshaped.max(axis=1)))
+        self._tail_x, self._tail_y = x[full:], y[full:]
+
+        while len(self.mins) > self.max_buckets:
+            pairs = np.arange(0, len(self.mins), 2)
+            self.x = self.x[pairs]
+            self.mins = np.minimum.reduceat(self.mins, pairs)
+            self.maxs = np.maximum.reduceat(self.maxs, pairs)
+            self.factor *= 2
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.x, self.mins, self.maxs, self._tail_x, self._tail_y))
+
+    def data(self):
+        """Return interleaved (x, y) min/max points like ``decimate_data``."""
+        return np.repeat(self.x, 2), np.dstack((self.mins, self.maxs)).flatten()
+
+
+class BufferPool:
+    """Thread-safe free list of (x, y) decimation output buffer pairs."""
+    def __init__(self, max_free=8):
+        self.max_free = max_free
+        self._lock = threading.Lock()
+        self._free = []
+
+    def acquire(self, size, y_dtype):
+        with self._lock:
+            for i, (x_buf, y_buf) in enumerate(self._free):
+                if len(x_buf) == size and y_buf.dtype == y_dtype:
+                    return self._free.pop(i)
+        return np.empty(size), np.empty(size, dtype=y_dtype)
+
+    def release(self, pair):
+        if pair is None:
+            return
+        with self._lock:
+            if len(self._free) >= self.max_free:
+                self._free.pop(0)
+            self._free.append(pair)
+
+    @property
+    def nbytes(self):
+        """Memory held by the free buffers."""
+        with self._lock:
+            return sum(x_buf.nbytes + y_buf.nbytes for x_buf, y_buf in self._free)
+
+    def clear(self):
+        """Drop the free buffers; buffers in use are unaffected."""
+        with self._lock:
+            self._free.clear()
+
+
+def build_pyramids(data, cancel_token=None):
+    """Precompute a MinMaxPyramid for every channel column of a loaded capture."""
+    columns = [c for c in data.columns if c.startswith('Value_CH')]
+    if not columns and 'Value' in data.columns:
+        columns = ['Value']
+    return {col: MinMaxPyramid.build(data[col].values, cancel_token=cancel_token)
+            for col in columns}
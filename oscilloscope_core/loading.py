@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+
+from parsers import AVAILABLE_PARSERS, PARSER_REGISTRY, PROFILER, get_csv_engine
+
+from .binary import read_binary_capture
+from .decimation import MinMaxPyramid, UniformTimeAxis, build_pyramids
+
+
+def capture_time_axis(metadata, data):
+    """Return the time axis of a loaded capture, computing it if it is not stored."""
+    if 'Second' in data.columns:
+        return data['Second'].values
+    sample_rate = float(metadata['Sample Rate (Hz)'][0])
+    start = float(metadata.get('Start Time (s)', [0.0])[0])
+    return UniformTimeAxis(len(data), sample_rate, start)
+
+
+def value_scaling(metadata):
+    """
+    Return (scale, offset) that turn the stored sample values into volts.
+
+    Only captures that keep the raw samples (memory-mapped or 'native' binary storage)
+    record them; for all others this is (1.0, 0.0).
+    """
+    scale = float(metadata.get('Value Scale', [1.0])[0])
+    offset = float(metadata.get('Value Offset', [0.0])[0])
+    return scale, offset
+
+
+def csv_cache_tag(parser, channels=None):
+    """
+    CaptureCache tag of a CSV capture parsed by ``parser``, optionally limited to
+    ``channels``. It includes the CSV engine, as engines may round values differently.
+    """
+    engine = get_csv_engine(parser.engine).name
+    tag = f"{parser.__class__.__name__}-{parser.version}-{parser.value_dtype.name}-{engine}"
+    if channels:
+        tag += "-CH" + "_".join(str(ch) for ch in channels)
+    return tag
+
+
+def read_cached_capture(cache, file_name, cache_tag):
+    """Return (metadata, data, pyramids) of a previously parsed capture, memory-mapped."""
+    cached = cache.load(file_name, cache_tag)
+    if cached is None:
+        return None
+    metadata, arrays = cached
+    columns = {}
+    for name, arr in arrays.items():
+        if name.startswith('column/'):
+            columns[name[len('column/'):]] = arr
+        elif name.startswith('alias/'):
+            # Stored once, under the column it duplicates
+            columns[name[len('alias/'):]] = arrays[f'column/{arr.item()}']
+    pyramids = {}
+    for col in columns:
+        prefix = f'pyramid/{col}/'
+        if any(name.startswith(prefix) for name in arrays):
+            pyramids[col] = MinMaxPyramid.from_arrays(arrays, prefix)
+    return metadata, pd.DataFrame(columns, copy=False), pyramids
+
+
+def _duplicated_channel(data, col):
+    """The 'Value_CHn' column that 'Value' holds a copy (or view) of, else None."""
+    if col != 'Value':
+        return None
+    values = data[col].values
+    for other in data.columns:
+        if (other.startswith('Value_CH') and data[other].dtype == values.dtype
+                and np.array_equal(data[other].values, values)):
+            return other
+    return None
+
+
+def write_cached_capture(cache, file_name, cache_tag, metadata, data, pyramids):
+    arrays = {}
+    for col in data.columns:
+        channel = _duplicated_channel(data, col)
+        if channel is None:
+            arrays[f'column/{col}'] = data[col].values
+        else:
+            arrays[f'alias/{col}'] = np.array(channel)
+    for col, pyramid in pyramids.items():
+        arrays.update(pyramid.to_arrays(f'pyramid/{col}/'))
+    cache.store(file_name, cache_tag, metadata, arrays)
+
+
+def load_csv_capture(file_name, progress_callback=None, cancel_token=None, chunk_callback=None,
+                     channels=None, parser=None, head=None, cache=None, pyramids=True):
+    """
+    Parse a CSV capture and return (metadata, data, pyramids).
+
+    The parser is picked from the file's head unless ``parser`` (and the ``head`` it
+    was picked from) are given. ``channels`` limits multi-channel files to those
+    channels. With a CaptureCache as ``cache``, a previous result for the same file is
+    returned memory-mapped, and a freshly parsed one is stored. ``pyramids=False``
+    skips building the zoom pyramids (and storing to the cache) for callers that do
+    not draw the capture.
+
+    Raises ValueError for files no parser accepts.
+    """
+    if parser is None:
+        parser, head = PARSER_REGISTRY.sniff(file_name, head)
+        if parser is None:
+            raise ValueError(
+                "Unsupported CSV format. Currently supported formats: " +
+                ", ".join(p.__class__.__name__.replace('CSVParser', '') for p in AVAILABLE_PARSERS))
+
+    cache_tag = csv_cache_tag(parser, channels)
+    if cache is not None:
+        with PROFILER.stage('cache read'):
+            cached = read_cached_capture(cache, file_name, cache_tag)
+        if cached is not None:
+            return cached
+
+    # Only parsers of multi-channel formats need to understand a channel selection
+    parse_options = {'channels': channels} if channels else {}
+    with PROFILER.stage('parse', parser=parser.__class__.__name__):
+        metadata, data = parser.parse(file_name, progress_callback, cancel_token=cancel_token,
+                                      chunk_callback=chunk_callback, head=head, **parse_options)
+    if not pyramids:
+        return metadata, data, {}
+
+    if progress_callback:
+        progress_callback(98, 100, "Building zoom pyramid...")
+    with PROFILER.stage('pyramid', rows=len(data)):
+        capture_pyramids = build_pyramids(data, cancel_token)
+
+    if cache is not None:
+        if progress_callback:
+            progress_callback(99, 100, "Writing cache...")
+        with PROFILER.stage('cache write'):
+            write_cached_capture(cache, file_name, cache_tag, metadata, data, capture_pyramids)
+    return metadata, data, capture_pyramids
+
+
+def load_binary_capture(file_name, params, progress_callback=None, cancel_token=None,
+                        channels=None, pyramids=True):
+    """
+    Read a raw binary capture (see ``read_binary_capture``) and return
+    (metadata, data, pyramids). ``channels`` overrides the selection in ``params``.
+    """
+    if channels:
+        params = dict(params, channels=channels)
+    with PROFILER.stage('parse', parser='read_binary_capture'):
+        metadata, data = read_binary_capture(file_name, params, progress_callback, cancel_token)
+    if not pyramids:
+        return metadata, data, {}
+    if progress_callback:
+        progress_callback(90, 100, "Building zoom pyramid...")
+    with PROFILER.stage('pyramid', rows=len(data)):
+        return metadata, data, build_pyramids(data, cancel_token)
+
+
+def load_capture(file_name, binary_params=None, **kwargs):
+    """
+    Load any supported capture and return (metadata, data, pyramids): a CSV file in
+    one of the parsers' formats, or a raw binary file if ``binary_params`` (as returned
+    by ``BinaryImportDialog.get_params()``) are given. Keyword arguments are passed on
+    to ``load_csv_capture`` or ``load_binary_capture``.
+    """
+    if binary_params is not None:
+        return load_binary_capture(file_name, binary_params, **kwargs)
+    return load_csv_capture(file_name, **kwargs)
@@ -0,0 +1,58 @@
+import math
+
+import numpy as np
+
+from .loading import capture_time_axis, value_scaling
+
+
+def time_measurement(t1, t2):
+    """Return (ΔT, frequency) between two time cursors; the frequency is inf if they coincide."""
+    delta_t = abs(t2 - t1)
+    freq = 1 / delta_t if delta_t != 0 else float('inf')
+    return delta_t, freq
+
+
+def voltage_measurement(v1, v2):
+    """Return ΔV between two voltage cursors."""
+    return abs(v2 - v1)
+
+
+def waveform_statistics(metadata, data, column='Value', t_start=None, t_end=None,
+                        block_size=1 << 20):
+    """
+    Return min, max, peak-to-peak, mean and RMS (in volts) of one column of a capture
+    between two times, by default over the whole capture.
+
+    Raw samples are scaled with ``value_scaling`` and processed ``block_size`` at a
+    time, so memory-mapped captures larger than RAM can be measured as well.
+    """
+    x = capture_time_axis(metadata, data)
+    y = data[column].values
+    start, stop = 0, len(x)
+    if t_start is not None:
+        start = int(np.searchsorted(x, t_start, side='left'))
+    if t_end is not None:
+        stop = int(np.searchsorted(x, t_end, side='right'))
+    if stop <= start:
+        raise ValueError("No samples in the given time range")
+
+    scale, offset = value_scaling(metadata)
+    lo, hi = math.inf, -math.inf
+    total = total_sq = 0.0
+    for i in range(start, stop, block_size):
+        block = y[i:min(i + block_size, stop)].astype(np.float64) * scale + offset
+        lo = min(lo, float(block.min()))
+        hi = max(hi, float(block.max()))
+        total += float(block.sum())
+        total_sq += float(np.dot(block, block))
+    samples = stop - start
+    return {
+        'samples': samples,
+        'start_time': float(x[start]),
+        'end_time': float(x[stop - 1]),
+        'min': lo,
+        'max': hi,
+        'peak_to_peak': hi - lo,
+        'mean': total / samples,
+        'rms': math.sqrt(total_sq / samples),
+    }
@@ -0,0 +1,101 @@
+import mmap
+import os
+
+import numpy as np
+
+
+def default_memory_budget() -> int:
+    """Memory budget in bytes: $OSCILLOSCOPE_VIEWER_MEMORY_MB, else 0 (no budget)."""
+    env_mb = os.environ.get('OSCILLOSCOPE_VIEWER_MEMORY_MB')
+    if env_mb:
+        try:
+            return max(0, int(float(env_mb) * (1 << 20)))
+        except ValueError:
+            pass
+    return 0
+
+
+def is_mapped(arr) -> bool:
+    """Whether ``arr`` is (a view of) a memory-mapped file rather than allocated memory."""
+    while arr is not None:
+        if isinstance(arr, (np.memmap, mmap.mmap)):
+            return True
+        arr = getattr(arr, 'base', None)
+    return False
+
+
+def column_channel(name):
+    """Channel number of a 'Value_CHn' column, else None."""
+    if name.startswith('Value_CH'):
+        try:
+            return int(name[len('Value_CH'):])
+        except ValueError:
+            pass
+    return None
+
+
+def _aliases(a, b) -> bool:
+    """
+    Whether ``a`` and ``b`` view the very same elements, e.g. 'Value' and the primary
+    channel. Unlike ``np.may_share_memory`` this is false for the interleaved channels
+    of one memory-mapped buffer, which overlap in address range but not in elements.
+    """
+    return (a.__array_interface__['data'][0] == b.__array_interface__['data'][0]
+            and a.shape == b.shape and a.strides == b.strides and a.dtype == b.dtype)
+
+
+def capture_memory(data, pyramids=None):
+    """
+    Account for the memory of a loaded capture: one entry per column of ``data`` and
+    per MinMaxPyramid in ``pyramids``.
+
+    Each entry is a dict with 'kind' ('column' or 'pyramid'), 'column', 'channel'
+    (None for time and 'Value'), 'dtype', 'bytes', 'mapped' and 'shared_with'.
+    Memory-mapped arrays only take up memory for the pages that were read, which the
+    OS can drop again, so they are reported but not counted as resident. Columns that
+    view another one's memory (e.g. 'Value' aliasing the primary channel) name it in
+    'shared_with' and count 0 bytes.
+    """
+    entries = []
+    seen = []  # (column, array) counted so far
+    for col in (data.columns if data is not None else ()):
+        arr = np.asarray(data[col].values)
+        owner = next((name for name, other in seen if _aliases(arr, other)), None)
+        entries.append({
+            'kind': 'column',
+            'column': col,
+            'channel': column_channel(col),
+            'dtype': arr.dtype.name,
+            'bytes': 0 if owner else arr.nbytes,
+            'mapped': is_mapped(arr),
+            'shared_with': owner,
+        })
+        if owner is None:
+            seen.append((col, arr))
+    for col, pyramid in (pyramids or {}).items():
+        levels = pyramid.levels
+        entries.append({
+            'kind': 'pyramid',
+            'column': col,
+            'channel': column_channel(col),
+            'dtype': levels[0][1].dtype.name if levels else None,
+            'bytes': pyramid.nbytes,
+            'mapped': any(is_mapped(mins) for _, mins, _ in levels),
+            'shared_with': None,
+        })
+    return entries
+
+
+def resident_bytes(entries, kinds=None):
+    """Bytes of the ``entries`` (optionally only of ``kinds``) that are not memory-mapped."""
+    return sum(e['bytes'] for e in entries
+               if not e['mapped'] and (kinds is None or e['kind'] in kinds))
+
+
+def process_rss_bytes():
+    """Current resident set size of this process, or None where it cannot be read."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
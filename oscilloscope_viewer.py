@@ -1,4 +1,7 @@
+import os
 import sys
+import threading
+import time
 import numpy as np
 import pandas as pd
 from pathlib import Path
@@ -6,11 +9,31 @@ import warnings
 from PySide6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout,
                               QPushButton, QWidget, QFileDialog, QLabel, QSpinBox,
                               QMessageBox, QProgressDialog, QComboBox, QDialog,
-                              QFormLayout, QDoubleSpinBox, QDialogButtonBox, QCheckBox)
-from PySide6.QtCore import Qt
+                              QFormLayout, QDoubleSpinBox, QDialogButtonBox, QCheckBox,
+                              QLineEdit, QGridLayout)
+from PySide6.QtCore import Qt, QEvent, QThread, QTimer, Signal
 from PySide6.QtGui import QCursor
 import pyqtgraph as pg
-from parsers import AVAILABLE_PARSERS
+from parsers import AVAILABLE_PARSERS, PARSER_REGISTRY, PROFILER, CancellationToken
+from oscilloscope_core import (BufferPool, CaptureCache, GrowingOverview, MinMaxPyramid,
+                               capture_memory, capture_time_axis, decimate_data,
+                               default_memory_budget, detect_header_offset,
+                               load_binary_capture, load_csv_capture, parse_channel_list,
+                               process_rss_bytes, resident_bytes, time_measurement,
+                               value_scaling, visible_slice, voltage_measurement)
+
+DEFAULT_MAX_LOADED_CHANNELS = 4
+
+
+def default_max_loaded_channels() -> int:
+    """Channels kept in memory when loading on demand: $OSCILLOSCOPE_VIEWER_MAX_CHANNELS, else 4."""
+    env_channels = os.environ.get('OSCILLOSCOPE_VIEWER_MAX_CHANNELS')
+    if env_channels:
+        try:
+            return max(1, int(env_channels))
+        except ValueError:
+            pass
+    return DEFAULT_MAX_LOADED_CHANNELS
 
 class CursorLine(pg.InfiniteLine):
     def __init__(self, angle=90, pos=0, movable=True, label=None):
@@ -116,11 +139,32 @@ class BinaryImportDialog(QDialog):
         self.chan_count_spin.valueChanged.connect(_sync_channel_index_max)
         _sync_channel_index_max(self.chan_count_spin.value())
 
+        # Channels to load (1-based); the others are skipped while reading
+        self.load_channels_edit = QLineEdit()
+        self.load_channels_edit.setPlaceholderText("All (e.g. 1,3-4)")
+        layout.addRow("Load Channels", self.load_channels_edit)
+        self.on_demand_check = QCheckBox("Load channels on demand (when selected)")
+        self.on_demand_check.setChecked(False)
+        layout.addRow(self.on_demand_check)
+
         # Auto-detect on load option
         self.auto_check = QCheckBox("Auto-detect header on load")
         self.auto_check.setChecked(False)
         layout.addRow(self.auto_check)
 
+        # How loaded samples are kept in memory; native keeps the raw integers and
+        # applies scale/offset only when drawing
+        self.storage_combo = QComboBox()
+        self.storage_combo.addItems(["float64", "float32", "native"])
+        layout.addRow("Storage", self.storage_combo)
+
+        # Map the file instead of reading it, for captures larger than RAM
+        self.mmap_check = QCheckBox("Memory-map file (no copy, for files larger than RAM)")
+        self.mmap_check.setChecked(False)
+        layout.addRow(self.mmap_check)
+        # Mapped samples are always used as stored in the file
+        self.mmap_check.toggled.connect(lambda checked: self.storage_combo.setDisabled(checked))
+
         # Tools row: Preview and Auto-detect buttons
         tools_row = QWidget()
         tools_layout = QHBoxLayout(tools_row)
@@ -191,7 +235,11 @@ class BinaryImportDialog(QDialog):
             "v_offset": float(self.voffset_spin.value()),
             "channel_count": int(self.chan_count_spin.value()),
             "channel_index": int(self.chan_index_spin.value()),
+            "channels": parse_channel_list(self.load_channels_edit.text()),
+            "on_demand": bool(self.on_demand_check.isChecked()),
             "auto_detect": bool(self.auto_check.isChecked()),
+            "memory_map": bool(self.mmap_check.isChecked()),
+            "storage_dtype": self.storage_combo.currentText(),
             "use_points": bool(self.use_points_check.isChecked()),
             "points_per_channel": int(self.points_spin.value()),
         }
@@ -356,74 +404,147 @@ class BinaryImportDialog(QDialog):
     def auto_detect_on_load(self) -> bool:
         return bool(self.auto_check.isChecked())
 
-def detect_header_offset(file_path: str, np_dtype: np.dtype, channel_count: int, channel_index: int, max_scan_bytes: int = 1 << 20) -> int:
+class ChannelSelectDialog(QDialog):
+    """Dialog to pick which channels of a multi-channel file to load."""
+    def __init__(self, channels, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Select Channels")
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("Channels to load:"))
+
+        # One checkbox per channel, all checked by default
+        grid = QGridLayout()
+        self.channel_checks = {}
+        for i, ch in enumerate(channels):
+            check = QCheckBox(f"CH{ch}")
+            check.setChecked(True)
+            grid.addWidget(check, i // 4, i % 4)
+            self.channel_checks[ch] = check
+        layout.addLayout(grid)
+
+        # Only load the first channel now and the others when they are selected
+        self.on_demand_check = QCheckBox("Load channels on demand (when selected)")
+        self.on_demand_check.setChecked(False)
+        layout.addWidget(self.on_demand_check)
+
+        # Dialog buttons; OK needs at least one channel
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel, parent=self)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        ok_button = buttons.button(QDialogButtonBox.Ok)
+        for check in self.channel_checks.values():
+            check.toggled.connect(lambda _: ok_button.setEnabled(bool(self.selected_channels())))
+
+    def selected_channels(self):
+        """Checked channel numbers, in order."""
+        return [ch for ch, check in self.channel_checks.items() if check.isChecked()]
+
+class LoadWorker(QThread):
     """
-    Heuristic header detector: scans the first portion of the file in aligned steps
-    and returns the offset where the data appears least "random" based on low
-    transition density and low unique value fraction in a window.
+    Runs a capture loading function on a background thread.
 
-    Returns byte offset.
+    ``load_fn(progress_callback, cancel_token, chunk_callback)`` must not touch any
+    widget; its progress is forwarded through the ``progress`` signal and its return
+    value is delivered through ``loaded`` on the GUI thread. Chunks passed to
+    ``chunk_callback`` are folded into a GrowingOverview whose points are sent through
+    ``preview`` at most every ``preview_interval`` seconds.
     """
-    step = max(1, int(np_dtype.itemsize) * max(1, channel_count))
-    file_size = Path(file_path).stat().st_size
-    limit = min(max_scan_bytes, file_size)
-
-    def window_score(arr: np.ndarray) -> float:
-        if arr.size < 64:
-            return float('inf')
-        diffs = np.diff(arr)
-        trans = np.count_nonzero(diffs != 0) / arr.size
-        uniq = len(np.unique(arr)) / arr.size
-        # Favor fewer transitions and fewer unique values (plateaus)
-        return trans + 0.75 * uniq
-
-    best_offset = 0
-    best_score = float('inf')
-    # Scan in steps; ensure we don't read too much each time
-    items_per_window = 4096
-    for off in range(0, int(limit), step * 8):  # hop by 8 samples worth to speed up
-        # Read enough raw items to get items_per_window for the selected channel
-        total_needed = items_per_window * channel_count
-        with open(file_path, 'rb') as f:
-            f.seek(off, 0)
-            raw = np.fromfile(f, dtype=np_dtype, count=total_needed)
-        if raw.size < items_per_window:
-            continue
-        if channel_count > 1:
-            usable = (raw.size // channel_count) * channel_count
-            raw = raw[:usable].reshape(-1, channel_count)[:, channel_index]
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore", category=RuntimeWarning)
-            arr = raw.astype(np.float64, copy=False)
-        s = window_score(arr)
-        if s < best_score:
-            best_score = s
-            best_offset = off
-    return best_offset
-
-def decimate_data(x, y, max_points=10000):
-    """Reduce number of points using min-max decimation to preserve signal features"""
-    if len(x) <= max_points:
-        return x, y
-        
-    # Calculate the decimation factor
-    decimation_factor = len(x) // (max_points // 2)
-    
-    # Reshape the data to perform min-max decimation
-    n_chunks = len(x) // decimation_factor
-    x_reshaped = x[:n_chunks * decimation_factor].reshape(-1, decimation_factor)
-    y_reshaped = y[:n_chunks * decimation_factor].reshape(-1, decimation_factor)
-    
-    # Get min and max for each chunk
-    x_decimated = x_reshaped[:, 0]  # Take first point of each chunk for x
-    y_mins = y_reshaped.min(axis=1)
-    y_maxs = y_reshaped.max(axis=1)
-    
-    # Interleave min and max values
-    x_final = np.repeat(x_decimated, 2)
-    y_final = np.dstack((y_mins, y_maxs)).flatten()
-    
-    return x_final, y_final
+    progress = Signal(int, int, str)
+    preview = Signal(object, object, int)
+    loaded = Signal(object)
+    failed = Signal(str)
+    cancelled = Signal()
+
+    def __init__(self, load_fn, parent=None, preview_points=10000, preview_interval=0.1):
+        super().__init__(parent)
+        self.load_fn = load_fn
+        self.cancel_token = CancellationToken()
+        self.overview = GrowingOverview(preview_points)
+        self.preview_interval = preview_interval
+        self._last_preview = None
+
+    def report_progress(self, current: int, total: int, message: str):
+        self.cancel_token.raise_if_cancelled()
+        self.progress.emit(current, total, message)
+
+    def report_chunk(self, chunk):
+        self.overview.append(chunk['Second'].values, chunk['Value'].values)
+        now = time.monotonic()
+        if self._last_preview is None or now - self._last_preview >= self.preview_interval:
+            self._last_preview = now
+            x, y = self.overview.data()
+            self.preview.emit(x, y, self.overview.samples)
+
+    def run(self):
+        try:
+            result = self.load_fn(self.report_progress, self.cancel_token, self.report_chunk)
+        except InterruptedError:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.loaded.emit(result)
+
+class DecimationWorker(QThread):
+    """
+    Runs decimation jobs on a background thread; the latest request wins.
+
+    ``submit`` replaces any job that has not started yet, so while the view is being
+    dragged only the most recent range gets computed. Results come back through
+    ``done`` together with the key they were submitted with, letting the GUI drop
+    those that were overtaken while running; the keys of jobs that raised come back
+    through ``failed``.
+    """
+    done = Signal(object, object)
+    failed = Signal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cond = threading.Condition()
+        self._pending = None
+        self._stopping = False
+
+    def submit(self, key, job):
+        with self._cond:
+            self._pending = (key, job)
+            self._cond.notify()
+
+    def stop(self):
+        with self._cond:
+            self._stopping = True
+            self._pending = None
+            self._cond.notify()
+        self.wait()
+
+    def run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                key, job = self._pending
+                self._pending = None
+            try:
+                result = job()
+            except Exception as e:
+                warnings.warn(f"Decimation failed: {e}")
+                self.failed.emit(key)
+                continue
+            self.done.emit(key, result)
+
+class ProfiledPlotWidget(pg.PlotWidget):
+    """PlotWidget that reports how long painting the plot takes to the PROFILER."""
+
+    def viewportEvent(self, event):
+        if not PROFILER.enabled or event.type() != QEvent.Paint:
+            return super().viewportEvent(event)
+        started = time.perf_counter()
+        handled = super().viewportEvent(event)
+        PROFILER.record('paint', started, time.perf_counter())
+        return handled
 
 class OscilloscopeCSVParser:
     def can_parse(self, first_lines):
@@ -446,9 +567,32 @@ class OscilloscopeViewer(QMainWindow):
         self.data = None
         self.metadata = {}
         self.raw_data = None  # Store complete dataset
+        self.pyramids = {}  # Column name -> MinMaxPyramid for fast zoomed-out redraws
+        self.capture_cache = CaptureCache()  # Parsed CSV captures, reused when re-opened
+        self._load_worker = None  # LoadWorker while a file is being loaded
+        self._load_progress = None
+        self._preview_curve = None  # Overview curve shown while a file is still loading
+        self._plot_key = None  # What the current curve shows, to skip redundant redraws
+        self.curves = {}  # Column name -> persistent PlotDataItem, updated via setData
+        self._shown_buffers = {}  # Column name -> output buffer pair its curve is showing
+        self._buffer_pool = BufferPool()
+        self._capture_generation = 0  # Bumped for every loaded capture
+        self.background_decimation = True  # Decimate on a worker thread (latest request wins)
         self.decimation_factor = 10000  # Default decimation points
         self.dark_mode = False  # Track dark mode state
         self.selected_channel: int | None = None  # Active channel (e.g., 1..4) if available
+        # Channels not in memory are loaded when selected; beyond this many, the least
+        # recently viewed ones are dropped again
+        self.max_loaded_channels = default_max_loaded_channels()
+        self._channel_loader = None  # channels -> LoadWorker function, for the current capture
+        self._loadable_channels = None  # Channels the current capture can show
+        self._next_channel_source = (None, None)  # (loader, channels) of the capture being loaded
+        self._channel_lru = []  # Channels in memory, least recently viewed first
+        self._loading_channel = None  # (channel, previously selected channel) while loading one
+        self._load_profile_since = None  # PROFILER time the current/last load started at
+        # Resident bytes of loaded data and caches above which cached structures are
+        # dropped (0: no budget)
+        self.memory_budget = default_memory_budget()
         
         # Define color schemes
         self.color_schemes = {
@@ -475,7 +619,7 @@ class OscilloscopeViewer(QMainWindow):
         layout = QVBoxLayout(central_widget)
         
         # Create plot widget
-        self.plot_widget = pg.PlotWidget()
+        self.plot_widget = ProfiledPlotWidget()
         self.plot_widget.setBackground('w')
         self.plot_widget.showGrid(x=True, y=True)
         self.plot_widget.setLabel('left', 'Voltage (V)')
@@ -491,13 +635,13 @@ class OscilloscopeViewer(QMainWindow):
         button_layout = QHBoxLayout()
         
         # Add buttons
-        load_button = QPushButton("Load CSV")
-        load_button.clicked.connect(self.load_csv)
-        button_layout.addWidget(load_button)
+        self.load_button = QPushButton("Load CSV")
+        self.load_button.clicked.connect(self.load_csv)
+        button_layout.addWidget(self.load_button)
 
-        load_bin_button = QPushButton("Load Binary")
-        load_bin_button.clicked.connect(self.load_binary)
-        button_layout.addWidget(load_bin_button)
+        self.load_bin_button = QPushButton("Load Binary")
+        self.load_bin_button.clicked.connect(self.load_binary)
+        button_layout.addWidget(self.load_bin_button)
         
         add_vcursor_button = QPushButton("Add Vertical Cursor")
         add_vcursor_button.clicked.connect(self.add_vertical_cursor)
@@ -515,6 +659,17 @@ class OscilloscopeViewer(QMainWindow):
         toggle_dark_mode = QPushButton("Toggle Dark Mode")
         toggle_dark_mode.clicked.connect(self.toggle_dark_mode)
         button_layout.addWidget(toggle_dark_mode)
+
+        # Stage timings (see parsers.profiling), off unless $OSCILLOSCOPE_VIEWER_PROFILE is set
+        self.profile_button = QPushButton("Profile")
+        self.profile_button.setCheckable(True)
+        self.profile_button.setChecked(PROFILER.enabled)
+        self.profile_button.toggled.connect(self.set_profiling)
+        button_layout.addWidget(self.profile_button)
+
+        self.save_trace_button = QPushButton("Save Trace...")
+        self.save_trace_button.clicked.connect(self.save_trace)
+        button_layout.addWidget(self.save_trace_button)
         
         # Add decimation control
         decimation_layout = QHBoxLayout()
@@ -545,6 +700,16 @@ class OscilloscopeViewer(QMainWindow):
         self.data_info_label = QLabel("No data loaded")
         self.data_info_label.setAlignment(Qt.AlignCenter)
         measurement_layout.addWidget(self.data_info_label)
+
+        # Memory of the loaded capture and caches; the tooltip breaks it down
+        self.memory_label = QLabel("Memory: ---")
+        self.memory_label.setAlignment(Qt.AlignCenter)
+        measurement_layout.addWidget(self.memory_label)
+
+        # Timings of the last load and the last frame, while profiling
+        self.profile_label = QLabel()
+        self.profile_label.setAlignment(Qt.AlignCenter)
+        measurement_layout.addWidget(self.profile_label)
         
         # Vertical cursor measurements
         self.vcursor_label = QLabel("ΔT: --- s\nFreq: --- Hz")
@@ -564,8 +729,24 @@ class OscilloscopeViewer(QMainWindow):
         self.plot_widget.getAxis('left').setTextPen('k')
         self.plot_widget.getAxis('bottom').setTextPen('k')
         
+        self._decimation_worker = DecimationWorker(self)
+        self._decimation_worker.done.connect(self._on_decimated)
+        self._decimation_worker.failed.connect(self._on_decimation_failed)
+        self._decimation_worker.start()
+
+        # Range changes are coalesced into at most one redraw per display frame
+        self._redraw_timer = QTimer(self)
+        self._redraw_timer.setSingleShot(True)
+        self._redraw_timer.setInterval(16)
+        self._redraw_timer.timeout.connect(self.update_plot)
+
         # Connect viewbox signals for dynamic decimation
         self.plot_widget.getViewBox().sigRangeChanged.connect(self.on_view_changed)
+
+        self._profile_timer = QTimer(self)
+        self._profile_timer.setInterval(500)
+        self._profile_timer.timeout.connect(self.update_profile_label)
+        self.set_profiling(PROFILER.enabled)
         
     def load_csv(self):
         file_name, _ = QFileDialog.getOpenFileName(
@@ -573,87 +754,48 @@ class OscilloscopeViewer(QMainWindow):
         )
         
         if file_name:
-            # Get file size for progress calculation
-            file_size = Path(file_name).stat().st_size
-            
-            # Create progress dialog
-            progress = QProgressDialog("Loading CSV file...", "Cancel", 0, 100, self)
-            progress.setWindowModality(Qt.WindowModal)
-            progress.setAutoClose(True)
-            progress.setMinimumDuration(0)  # Show immediately for large files
-            
-            def update_progress(current: int, total: int, message: str):
-                if progress.wasCanceled():
-                    raise InterruptedError("File loading cancelled by user")
-                progress.setLabelText(message)
-                progress.setValue(int(current * 100 / total))
-                QApplication.processEvents()  # Ensure UI remains responsive
-            
-            # Read first few lines to detect format
-            with open(file_name, 'r') as f:
-                first_lines = [f.readline() for _ in range(10)]
-            
-            # Find suitable parser
-            parser = None
-            for p in AVAILABLE_PARSERS:
-                if p.can_parse(first_lines):
-                    parser = p
-                    break
+            self._load_profile_since = PROFILER.now()
+            # Read the head of the file once and let every parser score it
+            parser, head = PARSER_REGISTRY.sniff(file_name)
                     
             if parser is None:
-                progress.close()
                 QMessageBox.critical(self, "Error", 
                     "Unsupported CSV format. Currently supported formats:\n" +
                     "\n".join(f"- {p.__class__.__name__.replace('CSVParser', '')}" 
                              for p in AVAILABLE_PARSERS))
                 return
-            
-            try:
-                # Parse the file with progress reporting
-                self.metadata, self.raw_data = parser.parse(file_name, update_progress)
-                
-                # Update data info label
-                self.data_info_label.setText(
-                    f"Total points: {len(self.raw_data):,}\n"
-                    f"Displayed points: {self.decimation_factor:,}"
-                )
-                
-                # Populate channel selector if available
-                channels = self.metadata.get('Channels')
-                self.channel_combo.blockSignals(True)
-                self.channel_combo.clear()
-                if channels:
-                    for ch in channels:
-                        self.channel_combo.addItem(f"CH{ch}")
-                    # Prefer CH1 if present, else first
-                    if 1 in channels:
-                        self.channel_combo.setCurrentText("CH1")
-                        self.selected_channel = 1
-                    else:
-                        self.channel_combo.setCurrentIndex(0)
-                        # Extract number from text
-                        try:
-                            self.selected_channel = int(self.channel_combo.currentText().replace('CH',''))
-                        except Exception:
-                            self.selected_channel = None
-                    self.channel_combo.setEnabled(True)
-                else:
-                    self.channel_combo.setEnabled(False)
-                    self.selected_channel = None
-                self.channel_combo.blockSignals(False)
 
-                # Plot decimated data
-                self.update_plot()
-                
-            except InterruptedError:
-                self.data_info_label.setText("Loading cancelled")
-                return
-            except Exception as e:
-                progress.close()
-                QMessageBox.critical(self, "Error", f"Failed to parse CSV file: {str(e)}")
-                return
-            finally:
-                progress.close()
+            # Let the user skip channels of multi-channel files before anything is parsed
+            channels, on_demand = None, False
+            try:
+                available = parser.available_channels(file_name, head)
+            except Exception:
+                available = None
+            if available and len(available) > 1:
+                dlg = ChannelSelectDialog(available, self)
+                if dlg.exec() != QDialog.Accepted:
+                    return
+                channels = dlg.selected_channels()
+                on_demand = dlg.on_demand_check.isChecked()
+                if channels == list(available):
+                    channels = None
+
+            def load_channels(channels):
+                """LoadWorker function reading ``channels`` (None: all) of the file."""
+                def load(update_progress, cancel_token, chunk_callback):
+                    # Parse with progress reporting, previewing chunks as they arrive
+                    return load_csv_capture(file_name, update_progress, cancel_token, chunk_callback,
+                                            channels=channels, parser=parser, head=head,
+                                            cache=self.capture_cache)
+                return load
+
+            loadable = (channels or available) if available else None
+            if on_demand:
+                channels = [1 if 1 in loadable else loadable[0]]
+            # Channels are only loaded (and dropped again) later if not all are loaded now
+            self._next_channel_source = (load_channels if on_demand else None, loadable)
+            self.start_loading("Loading CSV file...", "Failed to parse CSV file",
+                               load_channels(channels))
 
     def load_binary(self):
         file_name, _ = QFileDialog.getOpenFileName(
@@ -662,232 +804,178 @@ class OscilloscopeViewer(QMainWindow):
 
         if not file_name:
             return
+        self._load_profile_since = PROFILER.now()
 
         # Ask user for binary import settings
         dlg = BinaryImportDialog(self, file_path=file_name)
         if dlg.exec() != QDialog.Accepted:
             return
-        params = dlg.get_params()
-
-        # Optionally auto-detect header on load
-        if params.get("auto_detect"):
-            try:
-                endian_char = '<' if params['endian'].lower().startswith('l') else '>'
-                dtype_map = {
-                    'int8': 'i1', 'uint8': 'u1',
-                    'int16': 'i2', 'uint16': 'u2',
-                    'int32': 'i4', 'uint32': 'u4',
-                    'float32': 'f4', 'float64': 'f8',
-                }
-                base = dtype_map.get(params['dtype'])
-                if base is None:
-                    raise ValueError(f"Unsupported data type: {params['dtype']}")
-                np_dtype = np.dtype(endian_char + base)
-                ch_count = max(1, int(params['channel_count']))
-                ch_index = int(params['channel_index'])
-                auto_offset = detect_header_offset(file_name, np_dtype, ch_count, ch_index)
-                params['offset_bytes'] = int(auto_offset)
-            except Exception as _e:
-                # Fall back to user-provided offset if detection fails
-                pass
-
-        # Create progress dialog
-        progress = QProgressDialog("Loading binary file...", "Cancel", 0, 100, self)
-        progress.setWindowModality(Qt.WindowModal)
-        progress.setAutoClose(True)
-        progress.setMinimumDuration(0)
-
         try:
-            # Validate params
-            if params["sample_rate_hz"] <= 0:
-                raise ValueError("Sample rate must be > 0")
-
-            endian_char = '<' if params['endian'].lower().startswith('l') else '>'
-            dtype_map = {
-                'int8': 'i1', 'uint8': 'u1',
-                'int16': 'i2', 'uint16': 'u2',
-                'int32': 'i4', 'uint32': 'u4',
-                'float32': 'f4', 'float64': 'f8',
-            }
-            base = dtype_map.get(params['dtype'])
-            if base is None:
-                raise ValueError(f"Unsupported data type: {params['dtype']}")
-            np_dtype = np.dtype(endian_char + base)
-
-            offset = int(params['offset_bytes'])
-            length_bytes = int(params['length_bytes'])
-
-            # Align offset to sample boundary (dtype size * channel_count)
-            ch_count = max(1, int(params['channel_count']))
-            sample_bytes = np_dtype.itemsize * ch_count
-
-            # Determine effective offset/length with optional points-per-channel mode
-            file_size = Path(file_name).stat().st_size
-            use_points = bool(params.get('use_points'))
-            points_per_channel = int(params.get('points_per_channel', 0))
-            if use_points and points_per_channel > 0:
-                desired_bytes = points_per_channel * sample_bytes
-                eff_offset = max(0, file_size - desired_bytes)
-                eff_offset = (eff_offset // sample_bytes) * sample_bytes  # align down
-                # Limit length to desired bytes but not beyond file end
-                eff_length_bytes = min(desired_bytes, max(0, file_size - eff_offset))
-            else:
-                eff_offset = ((int(offset) + sample_bytes - 1) // sample_bytes) * sample_bytes
-                # Adjust length if provided to account for alignment shift
-                if length_bytes > 0:
-                    align_delta = max(0, eff_offset - offset)
-                    eff_length_bytes = max(0, length_bytes - align_delta)
-                else:
-                    eff_length_bytes = 0
-
-            progress.setValue(5)
-            progress.setLabelText("Reading file...")
-            if progress.wasCanceled():
-                raise InterruptedError("File loading cancelled by user")
+            params = dlg.get_params()
+        except ValueError as e:
+            QMessageBox.critical(self, "Error", str(e))
+            return
 
-            # Determine number of items to read
-            if eff_length_bytes > 0:
-                count = eff_length_bytes // np_dtype.itemsize
-            else:
-                # Compute remaining bytes to end of file
-                remaining_bytes = max(0, file_size - eff_offset)
-                count = remaining_bytes // np_dtype.itemsize
-
-            # Read using a file handle: seek to offset then fromfile
-            with open(file_name, 'rb') as f:
-                if eff_offset:
-                    f.seek(eff_offset, 0)
-                data = np.fromfile(f, dtype=np_dtype, count=count)
-
-            if data.size == 0:
-                raise ValueError("No data samples found with the given settings")
-
-            progress.setValue(30)
-            progress.setLabelText("Processing channels...")
-            if progress.wasCanceled():
-                raise InterruptedError("File loading cancelled by user")
-
-            ch_index = int(params['channel_index'])
-            # Note: we load all channels for plotting; channel_index is used for preview/detection only
-
-            if ch_count > 1:
-                # Assume simple interleaving by sample
-                total_samples = data.size // ch_count
-                if total_samples == 0:
-                    raise ValueError("Not enough data for the specified channel count")
-                data = data[: total_samples * ch_count]
-                data = data.reshape(total_samples, ch_count)
-            else:
-                # Single-channel data as 2D for consistent handling downstream
-                data = data.reshape(-1, 1)
-
-            progress.setValue(60)
-            progress.setLabelText("Building time axis...")
-            if progress.wasCanceled():
-                raise InterruptedError("File loading cancelled by user")
-
-            sr = float(params['sample_rate_hz'])
-            t = np.arange(data.shape[0], dtype=np.float64) / sr
-
-            # Apply scaling (same scale/offset for all channels)
-            scale = float(params['scale_v_per_unit'])
-            voffset = float(params['v_offset'])
-            y2d = data.astype(np.float64) * scale + voffset
-
-            progress.setValue(80)
-            progress.setLabelText("Creating DataFrame...")
-            if progress.wasCanceled():
-                raise InterruptedError("File loading cancelled by user")
-
-            # Build DataFrame with one column per channel and a primary 'Value' column
-            df_dict = {'Second': t}
-            for ch in range(ch_count):
-                df_dict[f'Value_CH{ch + 1}'] = y2d[:, ch]
-            # Prefer CH1 as primary Value if available
-            primary_ch = 1 if ch_count >= 1 else None
-            if primary_ch is not None:
-                df_dict['Value'] = df_dict[f'Value_CH{primary_ch}']
-            df = pd.DataFrame(df_dict)
-
-            # Metadata
-            metadata = {
-                'format': 'Binary',
-                'Horizontal Units': ['s'],
-                'Vertical Units': ['V'],
-                'Sample Rate (Hz)': [sr],
-                'Endian': [params['endian']],
-                'Data Type': [params['dtype']],
-                'Requested Header Offset (bytes)': [offset],
-                'Effective Header Offset (bytes)': [eff_offset],
-                'Header Alignment (bytes)': [sample_bytes],
-                'Data Length (bytes)': [
-                    eff_length_bytes if eff_length_bytes > 0 else (Path(file_name).stat().st_size - eff_offset)
-                ],
-            }
+        def load_channels(channels):
+            """LoadWorker function reading ``channels`` (None: as in params) of the file."""
+            def load(update_progress, cancel_token, chunk_callback):
+                return load_binary_capture(file_name, params, update_progress, cancel_token,
+                                           channels=channels)
+            return load
+
+        loadable = params['channels'] or list(range(1, max(1, params['channel_count']) + 1))
+        channels = None
+        if params.get('on_demand'):
+            channels = [1 if 1 in loadable else loadable[0]]
+        self._next_channel_source = (load_channels if params.get('on_demand') else None, loadable)
+        self.start_loading("Loading binary file...", "Failed to parse binary file",
+                           load_channels(channels))
+
+    def start_loading(self, label: str, error_prefix: str, load_fn, on_loaded=None):
+        """
+        Run ``load_fn`` on a LoadWorker while a progress dialog tracks it. Its result goes
+        to ``on_loaded``, by default ``_on_capture_loaded``.
+        """
+        if self._load_worker is not None:
+            return
 
-            # Record points-per-channel mode
-            metadata['Using Points Mode'] = [str(use_points)]
-            if use_points:
-                metadata['Points per Channel (requested)'] = [points_per_channel]
+        # Create progress dialog. It is not modal so the preview of a file that is
+        # still loading can already be zoomed and panned.
+        progress = QProgressDialog(label, "Cancel", 0, 100, self)
+        progress.setWindowModality(Qt.NonModal)
+        progress.setAutoClose(True)
+        progress.setMinimumDuration(0)  # Show immediately for large files
+
+        worker = LoadWorker(load_fn, self, preview_points=self.decimation_factor)
+        progress.canceled.connect(worker.cancel_token.cancel)
+        worker.progress.connect(self._on_load_progress)
+        worker.preview.connect(self._on_load_preview)
+        worker.loaded.connect(on_loaded or self._on_capture_loaded)
+        worker.failed.connect(lambda msg: QMessageBox.critical(self, "Error", f"{error_prefix}: {msg}"))
+        worker.cancelled.connect(lambda: self.data_info_label.setText("Loading cancelled"))
+        worker.finished.connect(self._on_load_finished)
+
+        self._load_worker = worker
+        self._load_progress = progress
+        self.load_button.setEnabled(False)
+        self.load_bin_button.setEnabled(False)
+        self.channel_combo.setEnabled(False)
+        worker.start()
+
+    def _on_load_progress(self, current: int, total: int, message: str):
+        if self._load_progress is not None:
+            self._load_progress.setLabelText(message)
+            self._load_progress.setValue(int(current * 100 / total))
+
+    def _on_load_preview(self, x, y, samples: int):
+        """Draw the overview of a file that is still loading."""
+        if self._preview_curve is None:
+            colors = self.color_schemes['dark' if self.dark_mode else 'light']
+            self._reset_curves()
+            self._preview_curve = self.plot_widget.plot(pen=pg.mkPen(colors['plot'], width=2))
+            self.plot_widget.enableAutoRange()
+        self._preview_curve.setData(x, y)
+        self.data_info_label.setText(
+            f"Loading... {samples:,} points so far\n"
+            f"Displayed points: {len(x):,}"
+        )
 
-            # Save channels metadata for UI selection
-            if ch_count >= 1:
-                metadata['Channels'] = list(range(1, ch_count + 1))
+    def _on_load_finished(self):
+        if self._preview_curve is not None:
+            # Loading failed or was cancelled: drop the partial preview again
+            self.plot_widget.removeItem(self._preview_curve)
+            self._preview_curve = None
+            self.update_plot()
+        progress, self._load_progress = self._load_progress, None
+        if progress is not None:
+            # Closing emits canceled(); the worker is already done at this point
+            progress.canceled.disconnect()
+            progress.close()
+            progress.deleteLater()
+        self._load_worker.deleteLater()
+        self._load_worker = None
+        self.load_button.setEnabled(True)
+        self.load_bin_button.setEnabled(True)
+        if self._loading_channel is not None:
+            # Loading a channel failed or was cancelled: go back to the one shown before
+            channel, previous = self._loading_channel
+            self._loading_channel = None
+            self._select_channel(previous)
+        self.channel_combo.setEnabled(self.channel_combo.count() > 0)
+
+    def _on_capture_loaded(self, result):
+        self.metadata, self.raw_data, self.pyramids = result
+        self._capture_generation += 1
+        self._channel_loader, self._loadable_channels = self._next_channel_source
+        self._next_channel_source = (None, None)
+        self._channel_lru = list(self.metadata.get('Channels') or [])
+        previewed = self._preview_curve is not None
+        if previewed:
+            self.plot_widget.removeItem(self._preview_curve)
+            self._preview_curve = None
+        self._reset_curves()
 
-            self.metadata, self.raw_data = metadata, df
+        # Update axis labels with units from metadata
+        x_unit = self.metadata.get('Horizontal Units', ['s'])[0]
+        y_unit = self.metadata.get('Vertical Units', ['V'])[0]
+        self.plot_widget.setLabel('left', f'Voltage ({y_unit})')
+        self.plot_widget.setLabel('bottom', f'Time ({x_unit})')
 
-            # Update UI similarly to CSV load
-            self.data_info_label.setText(
-                f"Total points: {len(self.raw_data):,}\n"
-                f"Displayed points: {self.decimation_factor:,}"
-            )
+        # Update data info label
+        self.data_info_label.setText(
+            f"Total points: {len(self.raw_data):,}\n"
+            f"Displayed points: {self.decimation_factor:,}"
+        )
 
-            # Populate channel selector if available
-            channels = self.metadata.get('Channels')
-            self.channel_combo.blockSignals(True)
-            self.channel_combo.clear()
-            if channels:
-                for ch in channels:
-                    self.channel_combo.addItem(f"CH{ch}")
-                # Prefer CH1 if present, else first
-                if 1 in channels:
-                    self.channel_combo.setCurrentText("CH1")
-                    self.selected_channel = 1
-                else:
-                    self.channel_combo.setCurrentIndex(0)
-                    # Extract number from text
-                    try:
-                        self.selected_channel = int(self.channel_combo.currentText().replace('CH',''))
-                    except Exception:
-                        self.selected_channel = None
-                self.channel_combo.setEnabled(True)
+        # Populate channel selector if available, including channels loaded on demand
+        channels = self._loadable_channels or self.metadata.get('Channels')
+        self.channel_combo.blockSignals(True)
+        self.channel_combo.clear()
+        if channels:
+            for ch in channels:
+                self.channel_combo.addItem(f"CH{ch}")
+            # Prefer CH1 if present, else first
+            if 1 in self._channel_lru:
+                self.channel_combo.setCurrentText("CH1")
+                self.selected_channel = 1
             else:
-                self.channel_combo.setEnabled(False)
-                self.selected_channel = None
-            self.channel_combo.blockSignals(False)
-
-            self.update_plot()
+                self.channel_combo.setCurrentIndex(
+                    channels.index(self._channel_lru[0]) if self._channel_lru else 0)
+                # Extract number from text
+                try:
+                    self.selected_channel = int(self.channel_combo.currentText().replace('CH',''))
+                except Exception:
+                    self.selected_channel = None
+            self.channel_combo.setEnabled(True)
+            # The channel shown counts as the most recently viewed one
+            if self.selected_channel in self._channel_lru:
+                self._channel_lru.remove(self.selected_channel)
+                self._channel_lru.append(self.selected_channel)
+        else:
+            self.channel_combo.setEnabled(False)
+            self.selected_channel = None
+        self.channel_combo.blockSignals(False)
 
-            progress.setValue(100)
-            progress.setLabelText("Done!")
+        # Show the whole new capture, regardless of the previous zoom. If it was
+        # previewed while loading, keep whatever view the user picked meanwhile.
+        if not previewed:
+            self.plot_widget.enableAutoRange()
 
-        except InterruptedError:
-            self.data_info_label.setText("Loading cancelled")
-            return
-        except Exception as e:
-            progress.close()
-            QMessageBox.critical(self, "Error", f"Failed to parse binary file: {str(e)}")
-            return
-        finally:
-            progress.close()
+        # Plot decimated data
+        self.update_plot()
+        self.enforce_memory_budget()
 
     def update_decimation(self, value):
         self.decimation_factor = value
         if self.raw_data is not None:
             self.update_plot()
             
+    def time_axis(self):
+        """Return the time axis of the loaded capture, computing it if it is not stored."""
+        return capture_time_axis(self.metadata, self.raw_data)
+
     def update_plot(self):
-        if self.raw_data is None:
+        if self.raw_data is None or self._preview_curve is not None:
             return
         
         # Determine which value column to display
@@ -908,38 +996,130 @@ class OscilloscopeViewer(QMainWindow):
         if y_col is None:
             return
 
-        # Decimate data for selected column
-        x_dec, y_dec = decimate_data(
-            self.raw_data['Second'].values,
-            self.raw_data[y_col].values,
-            max_points=self.decimation_factor
-        )
-        
-        # Get current color scheme
-        mode = 'dark' if self.dark_mode else 'light'
-        colors = self.color_schemes[mode]
-        
-        # Update plot
-        self.plot_widget.clear()
-        self.plot_widget.plot(x_dec, y_dec, pen=pg.mkPen(colors['plot'], width=2))
-        
-        # Restore cursors
-        for cursor in self.vertical_cursors + self.horizontal_cursors:
-            self.plot_widget.addItem(cursor)
-            
-        # Update axis labels with units from metadata
-        x_unit = self.metadata.get('Horizontal Units', ['s'])[0]
-        y_unit = self.metadata.get('Vertical Units', ['V'])[0]
-        self.plot_widget.setLabel('left', f'Voltage ({y_unit})')
-        self.plot_widget.setLabel('bottom', f'Time ({x_unit})')
+        x = self.time_axis()
+        y = self.raw_data[y_col].values
+        # Memory-mapped captures keep the raw sample values; scale only what is drawn
+        scale, offset = value_scaling(self.metadata)
+
+        # Only spend the point budget on the visible X range (plus a margin). While the
+        # view is auto-ranging on X the whole capture is visible, so use everything.
+        start, stop = 0, len(x)
+        view_box = self.plot_widget.getViewBox()
+        if not view_box.autoRangeEnabled()[0]:
+            x_min, x_max = view_box.viewRange()[0]
+            start, stop = visible_slice(x, x_min, x_max)
+
+        # Nothing to do if the curve already shows (or is about to show) exactly this,
+        # e.g. for a pure Y zoom
+        plot_key = (self._capture_generation, y_col, start, stop, self.decimation_factor)
+        if plot_key == self._plot_key:
+            return
+        self._plot_key = plot_key
+
+        pyramids = self.pyramids
+        pyramid = pyramids.get(y_col)
+        max_points = self.decimation_factor
+        pool = self._buffer_pool
+
+        def job():
+            # Runs on the decimation thread: only touches the arrays captured here
+            nonlocal pyramid
+            if pyramid is None:
+                # An earlier job for this capture may have built it since this was submitted
+                pyramid = pyramids.get(y_col)
+            if pyramid is None:
+                with PROFILER.stage('pyramid', rows=len(y)):
+                    pyramid = MinMaxPyramid.build(y)
+            with PROFILER.stage('decimate', samples=stop - start, max_points=max_points):
+                out = pool.acquire(2 * max_points + 2, y.dtype)
+                # Decimate data for selected column, from the pyramid when zoomed out far enough
+                decimated = pyramid.decimate(x, start, stop, max_points, out=out)
+                if decimated is None:
+                    decimated = decimate_data(
+                        x[start:stop],
+                        y[start:stop],
+                        max_points=max_points,
+                        out=out
+                    )
+            x_dec, y_dec = decimated
+            if x_dec.base is not out[0]:
+                # Small enough to show the raw samples; the buffers were not needed
+                pool.release(out)
+                out = None
+            if scale != 1.0 or offset != 0.0 or y_dec.dtype.kind != 'f':
+                y_dec = y_dec * scale + offset
+            return y_col, pyramid, x_dec, y_dec, out
+
+        if self.background_decimation:
+            self._decimation_worker.submit(plot_key, job)
+            return
+        try:
+            result = job()
+        except Exception as e:
+            warnings.warn(f"Decimation failed: {e}")
+            self._on_decimation_failed(plot_key)
+            return
+        self._on_decimated(plot_key, result)
+
+    def _on_decimation_failed(self, plot_key):
+        """Let the next update_plot for the same view try again instead of skipping it."""
+        if plot_key == self._plot_key:
+            self._plot_key = None
+
+    def _on_decimated(self, plot_key, result):
+        """Show a decimation result, unless a newer view has been requested since."""
+        y_col, pyramid, x_dec, y_dec, out = result
+        # Keep a pyramid built by the job even if its result is dropped, so later jobs
+        # for the same capture and column do not build it again
+        new_pyramid = (y_col not in self.pyramids and plot_key[0] == self._capture_generation
+                       and self.raw_data is not None and y_col in self.raw_data.columns)
+        if new_pyramid:
+            self.pyramids[y_col] = pyramid
+        if plot_key != self._plot_key:
+            self._buffer_pool.release(out)
+            return
+
+        # Update the channel's curve in place and only show that one
+        with PROFILER.stage('curve update', points=len(x_dec)):
+            curve = self._curve_for(y_col)
+            curve.setData(x_dec, y_dec)
+            for col, other in self.curves.items():
+                other.setVisible(col == y_col)
+        # The curve no longer references the previous buffers
+        self._buffer_pool.release(self._shown_buffers.pop(y_col, None))
+        if out is not None:
+            self._shown_buffers[y_col] = out
         
+        _, _, start, stop, _ = plot_key
         # Update data info label
         self.data_info_label.setText(
             f"Total points: {len(self.raw_data):,}\n"
-            f"Displayed points: {len(x_dec):,}"
+            f"Displayed points: {len(x_dec):,} (of {stop - start:,} in view)\n"
+            f"Zoom pyramid: {sum(p.nbytes for p in self.pyramids.values()) / 2**20:.1f} MB"
         )
+        if new_pyramid or out is not None:
+            self.enforce_memory_budget()
+
+    def _curve_for(self, col):
+        curve = self.curves.get(col)
+        if curve is None:
+            colors = self.color_schemes['dark' if self.dark_mode else 'light']
+            curve = self.plot_widget.plot(pen=pg.mkPen(colors['plot'], width=2))
+            self.curves[col] = curve
+        return curve
+
+    def _reset_curves(self):
+        """Remove the curves of the previous capture (cursors stay in place)."""
+        for curve in self.curves.values():
+            self.plot_widget.removeItem(curve)
+        self.curves.clear()
+        for pair in self._shown_buffers.values():
+            self._buffer_pool.release(pair)
+        self._shown_buffers.clear()
+        self._plot_key = None
 
     def on_channel_changed(self, text: str):
+        previous = self.selected_channel
         # Parse channel like "CH1" to integer 1
         try:
             if text.upper().startswith('CH'):
@@ -949,14 +1129,180 @@ class OscilloscopeViewer(QMainWindow):
                 self.selected_channel = None
         except Exception:
             self.selected_channel = None
+        if self.raw_data is None:
+            return
+        # Load the channel first if it is not in memory yet
+        if (self.selected_channel is not None and self._channel_loader is not None
+                and f"Value_CH{self.selected_channel}" not in self.raw_data.columns):
+            self.load_channel(self.selected_channel, previous)
+            return
+        if self.selected_channel in self._channel_lru:
+            self._channel_lru.remove(self.selected_channel)
+            self._channel_lru.append(self.selected_channel)
         # Re-plot with the selected channel
-        if self.raw_data is not None:
-            self.update_plot()
+        self.update_plot()
+
+    def _select_channel(self, channel):
+        """Show ``channel`` in the channel selector without loading anything."""
+        self.channel_combo.blockSignals(True)
+        self.channel_combo.setCurrentText(f"CH{channel}" if channel is not None else "")
+        self.channel_combo.blockSignals(False)
+        self.selected_channel = channel
+
+    def load_channel(self, channel, previous=None):
+        """
+        Load a channel of the current capture that is not in memory, on a LoadWorker.
+
+        The current curve stays up until it arrives; if loading fails or is cancelled,
+        ``previous`` is selected again.
+        """
+        load_fn = self._channel_loader([channel])
+        self._loading_channel = (channel, previous)
+        self._load_profile_since = PROFILER.now()
+        self.start_loading(f"Loading CH{channel}...", f"Failed to load CH{channel}",
+                           lambda update_progress, cancel_token, chunk_callback:
+                               load_fn(update_progress, cancel_token, None),
+                           on_loaded=self._on_channel_loaded)
+
+    def _on_channel_loaded(self, result):
+        metadata, data, pyramids = result
+        channel, previous = self._loading_channel
+        col = f"Value_CH{channel}"
+        if len(data) != len(self.raw_data):
+            QMessageBox.critical(self, "Error", f"CH{channel} has {len(data):,} points, "
+                                                f"the capture {len(self.raw_data):,}")
+            return
+        self._loading_channel = None
+
+        # Add the column without copying the ones already loaded
+        columns = {c: self.raw_data[c].values for c in self.raw_data.columns}
+        columns[col] = data[col].values
+        self.raw_data = pd.DataFrame(columns, copy=False)
+        if col in pyramids:
+            self.pyramids[col] = pyramids[col]
+        self._channel_lru.append(channel)
+        self.metadata['Channels'] = sorted(self._channel_lru)
+        self._evict_channels()
+        self.update_plot()
+        self.enforce_memory_budget()
+
+    def _evict_channels(self, keep=None):
+        """
+        Drop the least recently viewed channels of a capture loaded on demand beyond
+        ``keep`` (default: ``max_loaded_channels``). The selected channel is never dropped.
+        """
+        keep = max(1, keep or self.max_loaded_channels)
+        if self._channel_loader is None or len(self._channel_lru) <= keep:
+            return
+        candidates = [ch for ch in self._channel_lru if ch != self.selected_channel]
+        evicted = candidates[:len(self._channel_lru) - keep]
+        self._channel_lru = [ch for ch in self._channel_lru if ch not in evicted]
+        drop = {f"Value_CH{ch}" for ch in evicted}
+        # 'Value' duplicates the primary channel; channels are always shown by number
+        drop.add('Value')
+        self.raw_data = pd.DataFrame({c: self.raw_data[c].values for c in self.raw_data.columns
+                                      if c not in drop}, copy=False)
+        for col in drop:
+            self.pyramids.pop(col, None)
+            curve = self.curves.pop(col, None)
+            if curve is not None:
+                self.plot_widget.removeItem(curve)
+            self._buffer_pool.release(self._shown_buffers.pop(col, None))
+        self.metadata['Channels'] = sorted(self._channel_lru)
         
+    def memory_entries(self):
+        """
+        Memory of the loaded capture (see ``capture_memory``) plus the decimation output
+        buffers ('buffers') and the overview of a file that is still loading ('preview').
+        """
+        entries = capture_memory(self.raw_data, self.pyramids)
+        for col, (x_buf, y_buf) in self._shown_buffers.items():
+            entries.append({'kind': 'buffers', 'column': col, 'channel': None,
+                            'dtype': y_buf.dtype.name, 'bytes': x_buf.nbytes + y_buf.nbytes,
+                            'mapped': False, 'shared_with': None})
+        entries.append({'kind': 'buffers', 'column': '(free)', 'channel': None, 'dtype': None,
+                        'bytes': self._buffer_pool.nbytes, 'mapped': False, 'shared_with': None})
+        if self._load_worker is not None:
+            entries.append({'kind': 'preview', 'column': None, 'channel': None, 'dtype': 'float64',
+                            'bytes': self._load_worker.overview.nbytes, 'mapped': False,
+                            'shared_with': None})
+        return entries
+
+    def enforce_memory_budget(self):
+        """
+        Drop cached structures while loaded data and caches exceed ``memory_budget``:
+        first the free decimation buffers, then the zoom pyramids of channels not shown,
+        least recently viewed first (rebuilt when shown again), then, for captures
+        loaded on demand, the least recently viewed channels. The channel shown and its
+        pyramid are always kept.
+        """
+        def over_budget():
+            return resident_bytes(self.memory_entries()) > self.memory_budget
+
+        if self.memory_budget and self.raw_data is not None and over_budget():
+            self._buffer_pool.clear()
+            shown = {f"Value_CH{self.selected_channel}"}
+            if self._plot_key is not None:
+                shown.add(self._plot_key[1])
+            recency = {f"Value_CH{ch}": i for i, ch in enumerate(self._channel_lru)}
+            for col in sorted((c for c in self.pyramids if c not in shown),
+                              key=lambda c: recency.get(c, -1)):
+                if not over_budget():
+                    break
+                del self.pyramids[col]
+            keep = len(self._channel_lru) - 1
+            while self._channel_loader is not None and keep >= 1 and over_budget():
+                self._evict_channels(keep)
+                keep -= 1
+        self.update_memory_label()
+
+    def update_memory_label(self):
+        """Show the memory in use, and its breakdown by column, channel and dtype as tooltip."""
+        if self.raw_data is None:
+            self.memory_label.setText("Memory: ---")
+            self.memory_label.setToolTip("")
+            return
+        entries = self.memory_entries()
+        mb = 1 << 20
+        total = resident_bytes(entries)
+        mapped = sum(e['bytes'] for e in entries if e['mapped'])
+        budget = f" of {self.memory_budget / mb:,.0f} MB budget" if self.memory_budget else ""
+        over = " (over budget)" if self.memory_budget and total > self.memory_budget else ""
+        rss = process_rss_bytes()
+        self.memory_label.setText(
+            f"Memory: {total / mb:,.1f} MB{budget}{over}\n"
+            f"Data {resident_bytes(entries, ('column',)) / mb:,.1f} MB, "
+            f"pyramids {resident_bytes(entries, ('pyramid',)) / mb:,.1f} MB, "
+            f"buffers {resident_bytes(entries, ('buffers', 'preview')) / mb:,.1f} MB"
+            + (f"\nMapped from files: {mapped / mb:,.1f} MB" if mapped else "")
+            + (f"\nProcess RSS: {rss / mb:,.1f} MB" if rss is not None else "")
+        )
+
+        rows = [f"{'Kind':<8} {'Column':<12} {'dtype':<8} {'MB':>10}"]
+        for e in entries:
+            if e['shared_with']:
+                size = f"= {e['shared_with']}"
+            else:
+                size = f"{e['bytes'] / mb:,.2f}" + (" mapped" if e['mapped'] else "")
+            rows.append(f"{e['kind']:<8} {e['column'] or '':<12} {e['dtype'] or '':<8} {size:>10}")
+        by_dtype = {}
+        for e in entries:
+            if e['kind'] == 'column' and not e['mapped']:
+                by_dtype[e['dtype']] = by_dtype.get(e['dtype'], 0) + e['bytes']
+        rows.append("")
+        rows += [f"{'column':<8} {'all':<12} {dtype:<8} {size / mb:>10,.2f}"
+                 for dtype, size in by_dtype.items()]
+        self.memory_label.setToolTip("<pre>" + "\n".join(rows) + "</pre>")
+
     def on_view_changed(self, view_box, range_):
         """Called when the view range changes (zoom/pan)"""
         if self.raw_data is not None:
-            self.update_plot()
+            self.schedule_redraw()
+
+    def schedule_redraw(self):
+        """Redraw on the next frame; further requests until then are merged into it."""
+        if not self._redraw_timer.isActive():
+            self._redraw_timer.start()
             
     def add_vertical_cursor(self):
         if len(self.vertical_cursors) >= 2:
@@ -1012,15 +1358,16 @@ class OscilloscopeViewer(QMainWindow):
     def update_measurements(self):
         # Update vertical cursor measurements
         if len(self.vertical_cursors) == 2:
-            delta_t = abs(self.vertical_cursors[1].value() - self.vertical_cursors[0].value())
-            freq = 1/delta_t if delta_t != 0 else float('inf')
+            delta_t, freq = time_measurement(self.vertical_cursors[0].value(),
+                                             self.vertical_cursors[1].value())
             self.vcursor_label.setText(f"ΔT: {delta_t:.6f} s\nFreq: {freq:.2f} Hz")
         else:
             self.vcursor_label.setText("ΔT: --- s\nFreq: --- Hz")
             
         # Update horizontal cursor measurements
         if len(self.horizontal_cursors) == 2:
-            delta_v = abs(self.horizontal_cursors[1].value() - self.horizontal_cursors[0].value())
+            delta_v = voltage_measurement(self.horizontal_cursors[0].value(),
+                                          self.horizontal_cursors[1].value())
             self.hcursor_label.setText(f"ΔV: {delta_v:.6f} V")
         else:
             self.hcursor_label.setText("ΔV: --- V")
@@ -1040,10 +1387,65 @@ class OscilloscopeViewer(QMainWindow):
         # Update grid color
         self.plot_widget.getPlotItem().getViewBox().setBackgroundColor(colors['background'])
         
-        # Update plot if data is loaded
-        if self.raw_data is not None:
-            self.update_plot()
+        # Recolor the existing curves
+        for curve in list(self.curves.values()) + [self._preview_curve]:
+            if curve is not None:
+                curve.setPen(pg.mkPen(colors['plot'], width=2))
             
+    def set_profiling(self, enabled: bool):
+        """Turn the stage timers and their panel on or off."""
+        PROFILER.enabled = enabled
+        self.profile_label.setVisible(enabled)
+        self.save_trace_button.setVisible(enabled)
+        if enabled:
+            self.update_profile_label()
+            self._profile_timer.start()
+        else:
+            self._profile_timer.stop()
+
+    def update_profile_label(self):
+        """Show the stage timings of the last load and of the last frame drawn."""
+        def ms(seconds):
+            return f"{seconds * 1e3:.1f} ms" if seconds is not None else "---"
+
+        load = "Load: ---"
+        if self._load_profile_since is not None:
+            since = self._load_profile_since
+            load = (f"Load: sniff {ms(PROFILER.total('sniff', since))}, "
+                    f"parse {ms(PROFILER.total('parse', since))} "
+                    f"(concat {ms(PROFILER.total('concat', since))}), "
+                    f"pyramid {ms(PROFILER.total('pyramid', since))}")
+        self.profile_label.setText(
+            f"{load}\n"
+            f"Frame: decimate {ms(PROFILER.last('decimate'))}, "
+            f"curve {ms(PROFILER.last('curve update'))}, paint {ms(PROFILER.last('paint'))}")
+
+    def save_trace(self):
+        """Write the recorded timings as a Chrome trace (chrome://tracing, Perfetto)."""
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "Save Trace", "oscilloscope_viewer_trace.json", "JSON Files (*.json);;All Files (*)"
+        )
+        if not file_name:
+            return
+        try:
+            PROFILER.write_trace(file_name)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to save trace: {e}")
+
+    def closeEvent(self, event):
+        # Stop background threads before their QThread objects are destroyed
+        if self._load_worker is not None:
+            self._load_worker.cancel_token.cancel()
+            self._load_worker.wait()
+        self._decimation_worker.stop()
+        trace_file = os.environ.get('OSCILLOSCOPE_VIEWER_TRACE_FILE')
+        if trace_file and PROFILER.enabled:
+            try:
+                PROFILER.write_trace(trace_file)
+            except OSError as e:
+                warnings.warn(f"Could not write trace to {trace_file}: {e}")
+        super().closeEvent(event)
+
 def main():
     app = QApplication(sys.argv)
     
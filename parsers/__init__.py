@@ -1,4 +1,7 @@
-from .base_parser import OscilloscopeCSVParser
+from .base_parser import OscilloscopeCSVParser, CancellationToken, ColumnAssembler
+from .profiling import PROFILER, Profiler
+from .csv_engines import CSV_ENGINES, get_csv_engine
+from .registry import FileHead, ParserRegistry, ENTRY_POINT_GROUP
 from .siglent_parser import SiglentCSVParser
 from .batronix_parser import BatronixCSVParser
 from .batronix_display_parser import BatronixDisplayCSVParser
@@ -6,13 +9,18 @@ from .rigol_parser import RigolCSVParser
 from .rigol_arb_parser import RigolArbCSVParser
 from .pyqtgraph_parser import PyqtgraphCSVParser
 
-# List of all available parsers
-AVAILABLE_PARSERS = [
+# Picks a parser for a file from its head; plugins can add parsers through the
+# ENTRY_POINT_GROUP entry point group
+PARSER_REGISTRY = ParserRegistry([
     SiglentCSVParser(),
     BatronixCSVParser(),
     BatronixDisplayCSVParser(),
     RigolCSVParser(),
     RigolArbCSVParser(),
-    # Keep PyQtGraph last as a generic fallback for 2-column x,y CSVs
+    # Generic fallback for 2-column x,y CSVs; scores below the specific formats
     PyqtgraphCSVParser(),
-]
+])
+PARSER_REGISTRY.load_entry_points()
+
+# List of all available parsers
+AVAILABLE_PARSERS = PARSER_REGISTRY.parsers
@@ -1,11 +1,153 @@
-from typing import Optional, Callable
+import io
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Callable, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .csv_engines import PandasCSVEngine, get_csv_engine
+from .profiling import PROFILER
+
+
+def default_parse_workers() -> int:
+    """Threads used to parse one file: $OSCILLOSCOPE_VIEWER_PARSE_WORKERS, else up to 8 cores."""
+    env_workers = os.environ.get('OSCILLOSCOPE_VIEWER_PARSE_WORKERS')
+    if env_workers:
+        try:
+            return max(1, int(env_workers))
+        except ValueError:
+            pass
+    return max(1, min(8, os.cpu_count() or 1))
+
+
+def default_storage_dtype() -> np.dtype:
+    """Value column dtype: $OSCILLOSCOPE_VIEWER_STORAGE_DTYPE ('float32' or 'float64'), else float64."""
+    env_dtype = os.environ.get('OSCILLOSCOPE_VIEWER_STORAGE_DTYPE')
+    if env_dtype in ('float32', 'float64'):
+        return np.dtype(env_dtype)
+    return np.dtype(np.float64)
+
+
+class CancellationToken:
+    """Thread-safe flag used to ask a running parse to stop as soon as possible."""
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise InterruptedError("File loading cancelled by user")
+
+
+class ColumnAssembler:
+    """
+    Collects parsed chunks into contiguous float columns, filled in place.
+
+    Replaces keeping every chunk in a list and calling ``pd.concat`` at the end, which
+    holds the data twice and copies all of it once more. Capacity is reserved ahead
+    when the final row count can be estimated (see ``expect``) and otherwise grows
+    geometrically; ``finish`` trims the columns to the rows actually appended.
+
+    Growing allocates new columns and copies the filled rows over rather than resizing
+    in place, so arrays or views handed out earlier stay valid.
+
+    'Second' is always float64, as float32 cannot resolve sample intervals over a long
+    capture; the value columns use ``value_dtype``.
+    """
+    growth = 1.5
+    # finish() copies the columns to their final length only when more than this
+    # fraction of the capacity is unused; below it the slack is kept, which is cheaper
+    # than a copy of the whole column
+    max_slack = 0.125
+
+    def __init__(self, capacity: int = 0, value_dtype=np.float64):
+        self.capacity = int(capacity)
+        self.value_dtype = np.dtype(value_dtype)
+        self.length = 0
+        self.columns = {}
+
+    def reserve(self, rows: int):
+        """Make room for ``rows`` rows in total."""
+        rows = int(rows)
+        if rows <= self.capacity:
+            return
+        for name, arr in self.columns.items():
+            grown = np.empty(rows, dtype=arr.dtype)
+            grown[:self.length] = arr[:self.length]
+            self.columns[name] = grown
+        self.capacity = rows
+
+    def expect(self, rows: int):
+        """Reserve room for an estimated final row count, plus some slack."""
+        if rows > self.capacity:
+            self.reserve(int(rows * 1.05) + 1)
+
+    def append(self, chunk: pd.DataFrame):
+        with PROFILER.stage('concat', rows=len(chunk)):
+            self._append(chunk)
+
+    def _append(self, chunk: pd.DataFrame):
+        if not self.columns:
+            self.columns = {
+                name: np.empty(self.capacity, dtype=np.float64 if name == 'Second' else self.value_dtype)
+                for name in chunk.columns
+            }
+        end = self.length + len(chunk)
+        if end > self.capacity:
+            self.reserve(max(end, int(self.capacity * self.growth)))
+        for name, arr in self.columns.items():
+            arr[self.length:end] = chunk[name].to_numpy(dtype=arr.dtype)
+        self.length = end
+
+    def finish(self) -> pd.DataFrame:
+        """Return the assembled columns as a DataFrame that shares their memory."""
+        with PROFILER.stage('concat', rows=self.length):
+            trim = self.capacity - self.length > self.capacity * self.max_slack
+            self.columns = {name: arr[:self.length].copy() if trim else arr[:self.length]
+                            for name, arr in self.columns.items()}
+            self.capacity = self.length
+        return pd.DataFrame(self.columns, copy=False)
+
 
 class OscilloscopeCSVParser:
+    # Bump in a subclass whenever its parse() output changes, to invalidate cached results
+    version = 1
+    # CSV engine for read_csv_chunks ('pandas', 'pyarrow'; None: see get_csv_engine),
+    # its thread count (None: default_parse_workers()) and the approximate size of the
+    # newline-aligned byte ranges they parse
+    engine = None
+    workers = None
+    # dtype of the value columns (None: default_storage_dtype())
+    storage_dtype = None
+    parallel_block_bytes = 8 << 20
+
     def can_parse(self, first_lines):
         """Check if this parser can handle the CSV format based on first few lines"""
         raise NotImplementedError()
+
+    def score(self, head) -> float:
+        """
+        How well this parser matches a file, from its FileHead; 0 means not at all.
+
+        Specific formats score 1.0 by default. Generic fallbacks should override this
+        with a lower score so that any specific parser accepting the file wins.
+        """
+        return 1.0 if self.can_parse(head.lines(10)) else 0.0
         
-    def parse(self, file_path, progress_callback: Optional[Callable[[int, int, str], None]] = None):
+    def parse(self, file_path, progress_callback: Optional[Callable[[int, int, str], None]] = None,
+              cancel_token: Optional[CancellationToken] = None,
+              chunk_callback: Optional[Callable[[object], None]] = None, head=None,
+              channels=None):
         """
         Parse the CSV file and return (metadata, data_frame)
         
@@ -13,5 +155,186 @@ class OscilloscopeCSVParser:
             file_path: Path to the CSV file
             progress_callback: Optional callback function that takes (current, total, message)
                              to report progress during parsing
+            cancel_token: Optional CancellationToken, checked between chunks; parsing raises
+                          InterruptedError once it is cancelled
+            chunk_callback: Optional callback receiving each parsed chunk as a DataFrame with
+                            the final column names ('Second', 'Value', ...) as soon as it is
+                            read, e.g. to display a file while it is still loading
+            head: Optional FileHead already read while sniffing the format; header lines
+                  are taken from it instead of reopening the file (see ``iter_lines``)
+            channels: Optional channel numbers to load (see ``available_channels``); the
+                      columns of all other channels are skipped while reading. None loads
+                      every channel. Single-channel formats ignore it.
         """
         raise NotImplementedError()
+
+    def available_channels(self, file_path, head=None):
+        """
+        Channel numbers a multi-channel file holds, read from its header, or None for
+        single-channel formats. Any subset can be passed to ``parse`` as ``channels``.
+        """
+        return None
+
+    @staticmethod
+    def iter_lines(file_path, head=None):
+        """
+        Yield the text lines of a file like iterating ``open(file_path)`` would.
+
+        Lines are served from ``head`` while it lasts, and only if the caller keeps
+        iterating past it is the file opened and read on from there.
+        """
+        start = 0
+        if head is not None:
+            start = head.text_end
+            yield from head.lines()
+            if head.complete:
+                return
+        with open(file_path, 'rb') as f:
+            f.seek(start)
+            yield from io.TextIOWrapper(f)
+
+    @property
+    def value_dtype(self) -> np.dtype:
+        """dtype the value columns of parse() results are stored in."""
+        return np.dtype(self.storage_dtype or default_storage_dtype())
+
+    def new_assembler(self, capacity: int = 0) -> ColumnAssembler:
+        """ColumnAssembler for this parser's output, storing values as ``value_dtype``."""
+        return ColumnAssembler(capacity, value_dtype=self.value_dtype)
+
+    @staticmethod
+    def check_cancelled(cancel_token: Optional[CancellationToken]):
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+
+    @staticmethod
+    def report_position(progress_callback: Optional[Callable[[int, int, str], None]],
+                        position: int, total: int, progress_range: Tuple[int, int],
+                        message: str):
+        """Report ``position`` bytes of a ``total`` byte file as progress within ``progress_range``."""
+        if progress_callback:
+            start, end = progress_range
+            fraction = min(1.0, position / total) if total else 1.0
+            progress_callback(start + int((end - start) * fraction), 100, message)
+
+    def read_csv_chunks(self, file_path, progress_callback=None, cancel_token=None,
+                        progress_range=(10, 90), chunksize=100000, assembler=None,
+                        metadata=None, **read_csv_kwargs):
+        """
+        Yield the chunks of ``pd.read_csv(file_path, chunksize=chunksize, **read_csv_kwargs)``.
+
+        Files spanning several ``parallel_block_bytes`` are split into newline-aligned
+        byte ranges that are parsed concurrently by ``workers`` threads (the pandas C
+        parser releases the GIL while tokenizing); chunks are still yielded in file
+        order, one per range. This assumes no quoted field contains a line break, which
+        holds for all supported formats. With the pyarrow engine, files of any size are
+        read in ranges, each parsed by pyarrow's own threads as well. Options an engine
+        does not support fall back to pandas.
+
+        Progress is taken from the byte position reached, so it is exact without a
+        separate pass to estimate the row count. Cancellation is checked before every
+        chunk. If a ColumnAssembler is given, it is told the row count extrapolated from
+        the bytes read so far. If ``metadata`` is given, the worker count and throughput
+        are recorded in it as 'Parse Engine', 'Parse Workers' and 'Parse Throughput (MB/s)'.
+        """
+        engine = get_csv_engine(self.engine)
+        workers = self.workers or default_parse_workers()
+        started = time.perf_counter()
+        with open(file_path, 'rb') as f:
+            total = os.fstat(f.fileno()).st_size
+            layout = self._data_layout(f, read_csv_kwargs)
+            if layout is None or not engine.supports(layout[2]):
+                engine = PandasCSVEngine()
+            split = layout is not None and (
+                engine.name != 'pandas' or (workers > 1 and total >= 2 * self.parallel_block_bytes))
+            if not split:
+                workers = 1
+                f.seek(0)
+                chunks = ((chunk, f.tell())
+                          for chunk in pd.read_csv(f, chunksize=chunksize, **read_csv_kwargs))
+            else:
+                chunks = self._parallel_chunks(file_path, f, total, workers, engine, *layout)
+            rows = 0
+            for chunk, position in chunks:
+                self.check_cancelled(cancel_token)
+                rows += len(chunk)
+                if assembler is not None and position:
+                    assembler.expect(rows * total // position)
+                self.report_position(progress_callback, position, total, progress_range,
+                                     f"Reading data... ({rows:,} rows)")
+                yield chunk
+        if metadata is not None:
+            elapsed = max(time.perf_counter() - started, 1e-9)
+            metadata['Parse Engine'] = [engine.name]
+            metadata['Parse Workers'] = [workers]
+            metadata['Parse Throughput (MB/s)'] = [round(total / elapsed / 1e6, 1)]
+
+    @staticmethod
+    def _data_layout(f, read_csv_kwargs):
+        """
+        Locate the first data row for ``read_csv_kwargs``.
+
+        Returns (offset, column names, kwargs for headerless parsing of data rows), or
+        None when the options are not understood and the file must be read sequentially.
+        """
+        kwargs = dict(read_csv_kwargs)
+        skiprows = kwargs.pop('skiprows', 0) or 0
+        header = kwargs.pop('header', 'infer')
+        names = kwargs.pop('names', None)
+        if not isinstance(skiprows, int) or header not in ('infer', 0, None):
+            return None
+        f.seek(0)
+        for _ in range(skiprows):
+            f.readline()
+        if header == 0 or (header == 'infer' and names is None):
+            line = f.readline()
+            while line and not line.strip():  # pandas skips blank lines before the header
+                line = f.readline()
+            if names is None:
+                names = list(pd.read_csv(io.BytesIO(line), nrows=0).columns)
+        if names is None:
+            return None
+        return f.tell(), list(names), kwargs
+
+    def _parallel_chunks(self, file_path, f, total, workers, engine, offset, names, kwargs):
+        """Parse [offset, total) of ``f`` in newline-aligned ranges on a thread pool."""
+        bounds = [offset]
+        position = offset + self.parallel_block_bytes
+        while position < total:
+            f.seek(position)
+            f.readline()
+            position = f.tell()
+            if position >= total:
+                break
+            bounds.append(position)
+            position += self.parallel_block_bytes
+        bounds.append(total)
+
+        def parse_range(start, stop):
+            with open(file_path, 'rb') as fh:
+                fh.seek(start)
+                block = fh.read(stop - start)
+            if not block.strip():
+                return None
+            return engine.read_block(block, names, kwargs)
+
+        ranges = iter(zip(bounds[:-1], bounds[1:]))
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            try:
+                # Keep a bounded number of ranges in flight so memory stays flat
+                for start, stop in ranges:
+                    pending.append((stop, pool.submit(parse_range, start, stop)))
+                    if len(pending) >= 2 * workers:
+                        break
+                while pending:
+                    stop, future = pending.popleft()
+                    chunk = future.result()
+                    next_range = next(ranges, None)
+                    if next_range is not None:
+                        pending.append((next_range[1], pool.submit(parse_range, *next_range)))
+                    if chunk is not None:
+                        yield chunk, stop
+            finally:
+                for _, future in pending:
+                    future.cancel()
@@ -1,5 +1,6 @@
+import io
+
 import pandas as pd
-from pathlib import Path
 from typing import Optional, Callable
 from .base_parser import OscilloscopeCSVParser
 import re
@@ -19,6 +20,7 @@ class BatronixDisplayCSVParser(OscilloscopeCSVParser):
         Second: time in seconds (from "time in s")
         Value:  average of (CH1 minimum in V, CH1 maximum in V)
     """
+    version = 2
 
     def can_parse(self, first_lines):
         if not first_lines:
@@ -31,13 +33,39 @@ class BatronixDisplayCSVParser(OscilloscopeCSVParser):
         has_any_channel = bool(re.search(r'ch\d+\s+minimum', header_line)) and bool(re.search(r'ch\d+\s+maximum', header_line))
         return has_header1 and (has_any_channel or ('ch1 minimum' in header_line and 'ch1 maximum' in header_line))
 
-    def parse(self, file_path, progress_callback: Optional[Callable[[int, int, str], None]] = None):
+    def _header(self, file_path, head=None):
+        """
+        Return (second line, data column names, {channel: {'minimum': col, 'maximum': col}})
+        from the first lines of a Display file.
+        """
+        lines = self.iter_lines(file_path, head)
+        next(lines, '')  # "start time in s,time difference in s"
+        line2 = next(lines, '').strip()  # values
+        header = next((line for line in lines if line.strip()), '')  # pandas skips blank lines too
+        lines.close()
+        columns = list(pd.read_csv(io.StringIO(header), nrows=0).columns) if header else []
+
+        # Find all channel min/max columns, regardless of exact casing/spaces
+        channel_pairs = {}
+        for col in columns:
+            m = re.search(r'^ch(\d+)\s+(minimum|maximum)\s+in\s+v$', col.lower().strip())
+            if m:
+                ch = int(m.group(1))
+                kind = m.group(2)  # minimum or maximum
+                channel_pairs.setdefault(ch, {})[kind] = col
+        return line2, columns, channel_pairs
+
+    def available_channels(self, file_path, head=None):
+        _, _, channel_pairs = self._header(file_path, head)
+        return sorted(ch for ch, pair in channel_pairs.items()
+                      if 'minimum' in pair and 'maximum' in pair) or None
+
+    def parse(self, file_path, progress_callback: Optional[Callable[[int, int, str], None]] = None,
+              cancel_token=None, chunk_callback=None, head=None, channels=None):
         metadata = {}
 
-        # Read first two lines to capture start time and dt
-        with open(file_path, 'r') as f:
-            line1 = f.readline().strip()  # "start time in s,time difference in s"
-            line2 = f.readline().strip()  # values
+        # Read the first lines to capture start time, dt and the column layout
+        line2, columns, channel_pairs = self._header(file_path, head)
 
         # Try to parse start time and dt for metadata
         try:
@@ -55,112 +83,77 @@ class BatronixDisplayCSVParser(OscilloscopeCSVParser):
         metadata['Vertical Units'] = ['V']
         metadata['format'] = 'Batronix Display Data'
 
+        time_col = {c.lower(): c for c in columns}.get('time in s')
+        if not time_col:
+            raise ValueError('Missing "time in s" column in Display file header')
+        if not channel_pairs:
+            raise ValueError('No channel min/max columns found (expected e.g. "CH1 minimum in V", "CH1 maximum in V")')
+        available_channels = sorted(ch for ch, pair in channel_pairs.items()
+                                    if 'minimum' in pair and 'maximum' in pair)
+        if not available_channels:
+            raise ValueError('No complete min/max pairs found for any channel')
+
+        if channels is None:
+            selected = available_channels
+        else:
+            selected = sorted({int(ch) for ch in channels})
+            missing = [ch for ch in selected if ch not in available_channels]
+            if not selected or missing:
+                raise ValueError(
+                    f"Channels {', '.join(f'CH{ch}' for ch in missing) or '(none)'} not in file; "
+                    f"available: {', '.join(f'CH{ch}' for ch in available_channels)}")
+
+        # Choose primary channel for plotting: prefer CH1, else smallest channel number
+        primary_ch = 1 if 1 in selected else selected[0]
+
         # Progress init
         if progress_callback:
             progress_callback(0, 100, 'Reading data...')
 
-        chunks = []
+        assembler = self.new_assembler()
         chunk_size = 100000
 
-        # Estimate total rows to provide smoother progress
-        try:
-            file_size = Path(file_path).stat().st_size
-            # Estimate average data line length by sampling after the 3 header lines
-            sample_size = 1000
-            total_length = 0
-            lines_read = 0
-            with open(file_path, 'r') as f:
-                # Skip first 3 lines (2 metadata + 1 data header)
-                for _ in range(3):
-                    next(f)
-                for _ in range(sample_size):
-                    try:
-                        line = next(f)
-                        total_length += len(line.encode('utf-8'))
-                        lines_read += 1
-                    except StopIteration:
-                        break
-            if lines_read > 0:
-                avg_line_length = total_length / lines_read
-                # Rough estimate: remaining size divided by avg length
-                # Subtract an approximate size for the first 3 lines
-                estimated_total_rows = max(1, int((file_size - 200) / avg_line_length))
-            else:
-                estimated_total_rows = 1
-        except Exception:
-            estimated_total_rows = 1
-
-        rows_processed = 0
-
-        # Read data starting after the first 2 lines (so pandas sees the third line as header)
-        for chunk in pd.read_csv(
+        # Read data starting after the first 2 lines (so pandas sees the third line as
+        # header), parsing only the time column and the selected channels' columns
+        for chunk in self.read_csv_chunks(
             file_path,
-            skiprows=2,               # skip 2 metadata lines; keep header line
+            progress_callback,
+            cancel_token,
+            progress_range=(10, 90),
             chunksize=chunk_size,
+            assembler=assembler,
+            metadata=metadata,
+            skiprows=2,               # skip 2 metadata lines; keep header line
+            usecols=[time_col] + [channel_pairs[ch][kind] for ch in selected
+                                  for kind in ('minimum', 'maximum')],
         ):
-            # Normalize columns by name regardless of exact casing/spaces
-            cols_lower = {c.lower(): c for c in chunk.columns}
-            time_col = cols_lower.get('time in s')
-            if not time_col:
-                raise ValueError('Missing "time in s" column in Display file header')
-
-            # Find all channel min/max columns
-            channel_pairs = {}
-            for key, orig in cols_lower.items():
-                m = re.search(r'^ch(\d+)\s+(minimum|maximum)\s+in\s+v$', key.strip())
-                if m:
-                    ch = int(m.group(1))
-                    kind = m.group(2)  # minimum or maximum
-                    channel_pairs.setdefault(ch, {})[kind] = orig
-
-            if not channel_pairs:
-                raise ValueError('No channel min/max columns found (expected e.g. "CH1 minimum in V", "CH1 maximum in V")')
-
             # Build base dataframe with time
             norm = pd.DataFrame({'Second': pd.to_numeric(chunk[time_col], errors='coerce')})
 
-            # Track available channels
-            available_channels = []
-
-            # For each channel with both min and max, compute midline into Value_CHn
-            for ch, pair in sorted(channel_pairs.items()):
-                if 'minimum' in pair and 'maximum' in pair:
-                    min_s = pd.to_numeric(chunk[pair['minimum']], errors='coerce')
-                    max_s = pd.to_numeric(chunk[pair['maximum']], errors='coerce')
-                    mid = (min_s + max_s) / 2.0
-                    norm[f'Value_CH{ch}'] = mid
-                    available_channels.append(ch)
+            # For each selected channel, compute midline into Value_CHn
+            for ch in selected:
+                pair = channel_pairs[ch]
+                min_s = pd.to_numeric(chunk[pair['minimum']], errors='coerce')
+                max_s = pd.to_numeric(chunk[pair['maximum']], errors='coerce')
+                norm[f'Value_CH{ch}'] = (min_s + max_s) / 2.0
 
-            if not available_channels:
-                raise ValueError('No complete min/max pairs found for any channel')
-
-            # Choose primary channel for plotting: prefer CH1, else smallest channel number
-            primary_ch = 1 if 1 in available_channels else min(available_channels)
             norm['Value'] = norm[f'Value_CH{primary_ch}']
 
             # Drop rows with NaNs in time or primary value
             norm = norm.dropna(subset=['Second', 'Value'])
 
-            chunks.append(norm)
-            rows_processed += len(norm)
-            if progress_callback:
-                # Scale rows processed against estimate
-                progress = min(95, int(10 + 80 * (rows_processed / max(estimated_total_rows, 1))))
-                progress_callback(progress, 100, f"Reading data... (approximately {rows_processed:,} points)")
+            assembler.append(norm)
+            if chunk_callback:
+                chunk_callback(norm)
 
-        if not chunks:
+        if not assembler.columns:
             raise ValueError('No data rows found in Display file')
 
-        if progress_callback:
-            progress_callback(97, 100, 'Combining data chunks...')
-
-        data = pd.concat(chunks, ignore_index=True)
+        data = assembler.finish()
 
-        # Save channels metadata
-        value_ch_cols = [c for c in data.columns if c.startswith('Value_CH')]
-        channels = sorted(int(c.replace('Value_CH', '')) for c in value_ch_cols)
-        if channels:
-            metadata['Channels'] = channels
+        # Save channels metadata: the loaded ones, and all the file holds
+        metadata['Channels'] = selected
+        metadata['Available Channels'] = available_channels
 
         if progress_callback:
             progress_callback(100, 100, f'Done! Total points: {len(data):,}')
@@ -0,0 +1,87 @@
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+
+class PandasCSVEngine:
+    """Parses blocks of CSV rows with the pandas C parser. Always available."""
+    name = 'pandas'
+
+    def supports(self, read_csv_kwargs) -> bool:
+        return True
+
+    def read_block(self, block: bytes, names, read_csv_kwargs) -> pd.DataFrame:
+        return pd.read_csv(io.BytesIO(block), header=None, names=names, **read_csv_kwargs)
+
+
+class PyArrowCSVEngine:
+    """
+    Parses blocks of CSV rows with pyarrow's multithreaded columnar CSV reader.
+
+    Only understands the ``pd.read_csv`` options the parsers use for plain numeric
+    data (``usecols`` and a float ``dtype`` mapping); ``supports`` reports whether a
+    given set of options can be handled. Blocks pyarrow rejects but pandas accepts,
+    such as rows with a missing or extra field (a truncated last line, trailing
+    commas), are parsed with pandas instead so both engines load the same files.
+    """
+    name = 'pyarrow'
+
+    def __init__(self):
+        import pyarrow
+        import pyarrow.csv
+        self._pa = pyarrow
+        self._csv = pyarrow.csv
+
+    def supports(self, read_csv_kwargs) -> bool:
+        if not set(read_csv_kwargs) <= {'usecols', 'dtype'}:
+            return False
+        dtype = read_csv_kwargs.get('dtype', {})
+        return isinstance(dtype, dict) and all(np.dtype(t) == np.float64 for t in dtype.values())
+
+    def read_block(self, block: bytes, names, read_csv_kwargs) -> pd.DataFrame:
+        include = None
+        usecols = read_csv_kwargs.get('usecols')
+        if usecols is not None:
+            wanted = {names[c] if isinstance(c, int) else c for c in usecols}
+            include = [name for name in names if name in wanted]  # file order, like pandas
+        column_types = {name: self._pa.float64() for name in read_csv_kwargs.get('dtype', {})}
+        try:
+            table = self._csv.read_csv(
+                self._pa.py_buffer(block),
+                read_options=self._csv.ReadOptions(column_names=list(names)),
+                convert_options=self._csv.ConvertOptions(include_columns=include,
+                                                         column_types=column_types),
+            )
+        except self._pa.ArrowInvalid:
+            return PandasCSVEngine().read_block(block, names, read_csv_kwargs)
+        return table.to_pandas()
+
+
+CSV_ENGINES = {
+    'pandas': PandasCSVEngine,
+    'pyarrow': PyArrowCSVEngine,
+}
+
+
+def get_csv_engine(name=None):
+    """
+    Return a CSV engine instance by name.
+
+    ``None`` or ``'auto'`` uses $OSCILLOSCOPE_VIEWER_CSV_ENGINE if set, else pyarrow
+    when it is installed and pandas otherwise. Asking for pyarrow explicitly raises
+    ImportError when it is not installed.
+    """
+    if name in (None, 'auto'):
+        name = os.environ.get('OSCILLOSCOPE_VIEWER_CSV_ENGINE') or 'auto'
+    if name == 'auto':
+        try:
+            return PyArrowCSVEngine()
+        except ImportError:
+            return PandasCSVEngine()
+    try:
+        engine_class = CSV_ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown CSV engine: {name} (available: {', '.join(CSV_ENGINES)})")
+    return engine_class()
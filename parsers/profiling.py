@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+def profiling_enabled_by_default() -> bool:
+    """Whether to profile from the start: $OSCILLOSCOPE_VIEWER_PROFILE set to 1/true/yes/on."""
+    return os.environ.get('OSCILLOSCOPE_VIEWER_PROFILE', '').lower() in ('1', 'true', 'yes', 'on')
+
+
+class _Stage:
+    """Context manager recording one event of a Profiler."""
+    __slots__ = ('profiler', 'name', 'args', 'start')
+
+    def __init__(self, profiler, name, args):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.record(self.name, self.start, time.perf_counter(), **self.args)
+        return False
+
+
+class _NoStage:
+    """Stand-in for _Stage while profiling is off."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NO_STAGE = _NoStage()
+
+
+class Profiler:
+    """
+    Records how long named stages (sniff, parse, decimate, paint, ...) take, on any thread.
+
+    ``stage(name)`` is a context manager that times its body; while ``enabled`` is
+    false it does nothing and costs a single attribute check. The most recent
+    ``max_events`` events are kept and can be summed up (``total``, ``last``) or
+    written out in Chrome's trace event format (``write_trace``) for chrome://tracing
+    or Perfetto.
+    """
+
+    def __init__(self, enabled=False, max_events=200_000):
+        self.enabled = enabled
+        self.events = deque(maxlen=max_events)  # (name, start, end, thread id, args)
+        self._thread_names = {}
+        self._origin = time.perf_counter()
+
+    def stage(self, name, **args):
+        """Time the ``with`` block as an event called ``name``, with ``args`` attached."""
+        if not self.enabled:
+            return _NO_STAGE
+        return _Stage(self, name, args)
+
+    def record(self, name, start, end, **args):
+        """Add an event measured with ``time.perf_counter()`` by the caller."""
+        if not self.enabled:
+            return
+        tid = threading.get_ident()
+        if tid not in self._thread_names:
+            self._thread_names[tid] = threading.current_thread().name
+        self.events.append((name, start, end, tid, args))
+
+    @staticmethod
+    def now():
+        """Current time on the events' clock, e.g. to sum up what happened since then."""
+        return time.perf_counter()
+
+    def clear(self):
+        self.events.clear()
+
+    def last(self, name):
+        """Duration in seconds of the most recent ``name`` event, or None."""
+        # Snapshot first: other threads keep appending while this runs
+        for event in reversed(list(self.events)):
+            if event[0] == name:
+                return event[2] - event[1]
+        return None
+
+    def total(self, name, since=None):
+        """Summed duration in seconds of the ``name`` events that started at or after ``since``."""
+        return sum(end - start for event_name, start, end, _, _ in list(self.events)
+                   if event_name == name and (since is None or start >= since))
+
+    def trace_events(self):
+        """The events as a list of Chrome trace event dicts (complete events, in µs)."""
+        pid = os.getpid()
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                   'args': {'name': name}} for tid, name in list(self._thread_names.items())]
+        for name, start, end, tid, args in list(self.events):
+            events.append({
+                'name': name,
+                'cat': 'oscilloscope_viewer',
+                'ph': 'X',
+                'ts': round((start - self._origin) * 1e6, 3),
+                'dur': round((end - start) * 1e6, 3),
+                'pid': pid,
+                'tid': tid,
+                'args': args,
+            })
+        return events
+
+    def write_trace(self, path):
+        """Write the recorded events to ``path`` as Chrome trace event JSON."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.trace_events(), 'displayTimeUnit': 'ms'}, f,
+                      default=str)
+
+
+# Shared by the parsers, the loading functions and the viewer
+PROFILER = Profiler(enabled=profiling_enabled_by_default())
@@ -1,5 +1,4 @@
 import pandas as pd
-from pathlib import Path
 from typing import Optional, Callable
 from .base_parser import OscilloscopeCSVParser
 
@@ -58,7 +57,12 @@ class PyqtgraphCSVParser(OscilloscopeCSVParser):
                 break
         return False
 
-    def parse(self, file_path, progress_callback: Optional[Callable[[int, int, str], None]] = None):
+    def score(self, head) -> float:
+        # Generic x,y fallback: any specific format that accepts the file wins
+        return 0.1 if self.can_parse(head.lines(10)) else 0.0
+
+    def parse(self, file_path, progress_callback: Optional[Callable[[int, int, str], None]] = None,
+              cancel_token=None, chunk_callback=None, head=None, channels=None):
         metadata = {
             'format': 'PyQtGraph Export'
         }
@@ -67,85 +71,63 @@ class PyqtgraphCSVParser(OscilloscopeCSVParser):
             progress_callback(0, 100, 'Analyzing file...')
 
         # Detect whether the first line is a header with x/y labels
-        with open(file_path, 'r') as f:
-            first_line = (f.readline() or '').strip()
+        lines = self.iter_lines(file_path, head)
+        first_line = next(lines, '').strip()
+        lines.close()
         parts = [p.strip().lower() for p in first_line.split(',')]
         has_xy_header = len(parts) >= 2 and parts[0].startswith('x') and parts[1].startswith('y')
 
-        # Estimate rows for progress reporting
-        try:
-            file_size = Path(file_path).stat().st_size
-            sample_size = 2000
-            total_length = 0
-            lines_read = 0
-            with open(file_path, 'r') as f:
-                # Skip header if present
-                if has_xy_header:
-                    next(f)
-                for _ in range(sample_size):
-                    try:
-                        line = next(f)
-                        total_length += len(line.encode('utf-8'))
-                        lines_read += 1
-                    except StopIteration:
-                        break
-            if lines_read > 0 and total_length > 0:
-                avg_line_len = total_length / lines_read
-                estimated_total_rows = max(1, int((file_size - (len(first_line) + 2)) / max(avg_line_len, 1)))
-            else:
-                estimated_total_rows = 1
-        except Exception:
-            estimated_total_rows = 1
-
         if progress_callback:
             progress_callback(5, 100, 'Reading data...')
 
-        chunks = []
+        assembler = self.new_assembler()
         chunk_size = 100_000
-        rows_processed = 0
 
         if has_xy_header:
             # Read with header, keep only first two columns
-            for chunk in pd.read_csv(
+            for chunk in self.read_csv_chunks(
                 file_path,
-                usecols=[0, 1],
+                progress_callback,
+                cancel_token,
+                progress_range=(10, 90),
                 chunksize=chunk_size,
+                assembler=assembler,
+                metadata=metadata,
+                usecols=[0, 1],
             ):
                 # Normalize to standard columns
                 x = pd.to_numeric(chunk.iloc[:, 0], errors='coerce')
                 y = pd.to_numeric(chunk.iloc[:, 1], errors='coerce')
                 norm = pd.DataFrame({'Second': x, 'Value': y})
                 norm = norm.dropna(subset=['Second', 'Value'])
-                chunks.append(norm)
-                rows_processed += len(norm)
-                if progress_callback:
-                    prog = min(95, int(10 + 80 * (rows_processed / max(estimated_total_rows, 1))))
-                    progress_callback(prog, 100, f'Reading data... (approximately {rows_processed:,} points)')
+                assembler.append(norm)
+                if chunk_callback:
+                    chunk_callback(norm)
         else:
             # No header: treat first two columns as data
-            for chunk in pd.read_csv(
+            for chunk in self.read_csv_chunks(
                 file_path,
+                progress_callback,
+                cancel_token,
+                progress_range=(10, 90),
+                chunksize=chunk_size,
+                assembler=assembler,
+                metadata=metadata,
                 header=None,
                 names=['Second', 'Value'],
                 usecols=[0, 1],
-                chunksize=chunk_size,
             ):
                 chunk['Second'] = pd.to_numeric(chunk['Second'], errors='coerce')
                 chunk['Value'] = pd.to_numeric(chunk['Value'], errors='coerce')
                 norm = chunk.dropna(subset=['Second', 'Value'])
-                chunks.append(norm)
-                rows_processed += len(norm)
-                if progress_callback:
-                    prog = min(95, int(10 + 80 * (rows_processed / max(estimated_total_rows, 1))))
-                    progress_callback(prog, 100, f'Reading data... (approximately {rows_processed:,} points)')
+                assembler.append(norm)
+                if chunk_callback:
+                    chunk_callback(norm)
 
-        if not chunks:
+        if not assembler.columns:
             raise ValueError('No data rows found in PyQtGraph CSV file')
 
-        if progress_callback:
-            progress_callback(97, 100, 'Combining data...')
-
-        data = pd.concat(chunks, ignore_index=True)
+        data = assembler.finish()
 
         if progress_callback:
             progress_callback(100, 100, f'Done! Total points: {len(data):,}')
@@ -0,0 +1,102 @@
+import io
+import os
+import warnings
+from importlib.metadata import entry_points
+
+from .profiling import PROFILER
+
+# Entry point group third-party packages use to provide parsers, e.g. in pyproject.toml:
+#   [project.entry-points."oscilloscope_viewer.parsers"]
+#   my_format = "my_package.parsers:MyFormatCSVParser"
+ENTRY_POINT_GROUP = 'oscilloscope_viewer.parsers'
+
+
+class FileHead:
+    """
+    The first bytes of a file, read once and shared by every parser.
+
+    Parsers are scored on it while sniffing, and the chosen parser reads its header
+    from it (see ``OscilloscopeCSVParser.iter_lines``) instead of reopening the file.
+    """
+    default_size = 64 << 10
+
+    def __init__(self, file_path, data: bytes, file_size: int):
+        self.file_path = file_path
+        self.data = data
+        self.file_size = file_size
+
+    @classmethod
+    def read(cls, file_path, size=None):
+        with open(file_path, 'rb') as f:
+            file_size = os.fstat(f.fileno()).st_size
+            data = f.read(size or cls.default_size)
+        return cls(file_path, data, file_size)
+
+    @property
+    def complete(self) -> bool:
+        """True when the head holds the whole file."""
+        return len(self.data) >= self.file_size
+
+    @property
+    def text_end(self) -> int:
+        """Byte length of the head up to its last complete line."""
+        return len(self.data) if self.complete else self.data.rfind(b'\n') + 1
+
+    def lines(self, count=None):
+        """Complete text lines of the head (with line endings), like iterating the file."""
+        lines = []
+        for line in io.TextIOWrapper(io.BytesIO(self.data[:self.text_end]), errors='replace'):
+            if count is not None and len(lines) >= count:
+                break
+            lines.append(line)
+        return lines
+
+
+class ParserRegistry:
+    """
+    Ordered collection of parser instances that picks the best one for a file.
+
+    Every parser scores the file's head (see ``OscilloscopeCSVParser.score``); the
+    highest positive score wins and ties go to the parser registered first.
+    """
+    def __init__(self, parsers=()):
+        self.parsers = list(parsers)
+
+    def register(self, parser):
+        """Add a parser instance (or a parser class, which is instantiated)."""
+        if isinstance(parser, type):
+            parser = parser()
+        self.parsers.append(parser)
+        return parser
+
+    def load_entry_points(self, group=ENTRY_POINT_GROUP):
+        """Register the parsers advertised by installed packages under ``group``."""
+        try:
+            found = entry_points(group=group)
+        except TypeError:  # Python < 3.10
+            found = entry_points().get(group, [])
+        for entry_point in found:
+            try:
+                self.register(entry_point.load())
+            except Exception as e:
+                warnings.warn(f"Could not load parser plugin {entry_point.name!r}: {e}")
+
+    def sniff(self, file_path, head=None):
+        """
+        Read the head of ``file_path`` once and return (best parser or None, head).
+        """
+        with PROFILER.stage('sniff', file=os.path.basename(str(file_path))):
+            if head is None:
+                head = FileHead.read(file_path)
+            best, best_score = None, 0.0
+            for parser in self.parsers:
+                try:
+                    score = parser.score(head)
+                except Exception as e:
+                    # Skip it, but say why, e.g. for a broken plugin
+                    warnings.warn(f"Parser {parser.__class__.__name__} failed to score "
+                                  f"{file_path}: {e.__class__.__name__}: {e}")
+                    continue
+                if score > best_score:
+                    best, best_score = parser, score
+        return best, head
@@ -1,6 +1,5 @@
 import pandas as pd
 import numpy as np
-from pathlib import Path
 from .base_parser import OscilloscopeCSVParser
 
 class RigolArbCSVParser(OscilloscopeCSVParser):
@@ -8,88 +7,68 @@ class RigolArbCSVParser(OscilloscopeCSVParser):
         # Rigol Arb files start with this specific header
         return any('RIGOL:CSV DATA FILE' in line for line in first_lines)
         
-    def parse(self, file_path, progress_callback=None):
+    # 2: negative voltages are no longer dropped
+    version = 2
+
+    def parse(self, file_path, progress_callback=None, cancel_token=None,
+              chunk_callback=None, head=None, channels=None):
         metadata = {}
-        file_size = Path(file_path).stat().st_size
         
         if progress_callback:
             progress_callback(0, 100, "Reading metadata...")
         
         # Read and parse metadata
-        data_lines = []
-        with open(file_path, 'r') as f:
-            for i, line in enumerate(f):
-                line = line.strip()
-                if not line:  # Skip empty lines
-                    continue
-                    
-                if ':' in line and i < 10:  # Only parse metadata in first few lines
-                    key, value = line.split(':', 1)
-                    metadata[key] = value
-                elif line[0].isdigit():  # Found start of data
-                    data_lines.append(line)  # Keep this data line
-                    break
-        
+        data_line = None
+        for i, line in enumerate(self.iter_lines(file_path, head)):
+            line = line.strip()
+            if not line:  # Skip empty lines
+                continue
+                
+            if ':' in line and i < 10:  # Only parse metadata in first few lines
+                key, value = line.split(':', 1)
+                metadata[key] = value
+            elif line[0].isdigit() or line[0] in '+-.':  # Found start of data
+                data_line = i
+                break
+
         if progress_callback:
             progress_callback(10, 100, "Reading data values...")
             
         # Get sample rate from metadata
         sample_rate = float(metadata.get('Sample Rate', '1'))  # Default to 1 if not found
-        number_of_data_points = int(metadata.get('DATA Number', '1'))
         current_data_point_position = 0
         
-        # Read the voltage values in chunks
-        voltage_values = []
+        # Parse the one-value-per-line body in bulk, straight into preallocated columns
+        assembler = self.new_assembler(capacity=int(metadata.get('DATA Number', '0')))
         chunk_size = 100000
-        current_chunk = []
-        
-        # Process the first data line we found
-        if data_lines:
-            try:
-                current_chunk.append(float(data_lines[0]))
-            except ValueError:
-                pass
-        
-        # Continue reading the rest of the file
-        with open(file_path, 'r') as f:
-            # Skip to where we found the first data line
-            for _ in range(len(metadata) + 1):  # +1 for the first data line we already processed
-                f.readline()
-                
-            for line in f:
-                line = line.strip()
-                if line and line[0].isdigit():
-                    try:
-                        current_chunk.append(float(line))
-                        if len(current_chunk) >= chunk_size:
-                            voltage_values.extend(current_chunk)
-                            current_data_point_position += len(current_chunk)
-                            current_chunk = []
-                            if progress_callback:
-                                progress = min(90, int(10 + 80 * (current_data_point_position / number_of_data_points)))
-                                progress_callback(progress, 100, 
-                                               f"Reading values... ({len(voltage_values):,} points)")
-                    except ValueError:
-                        continue
-                        
-        # Add any remaining values
-        if current_chunk:
-            voltage_values.extend(current_chunk)
-            current_data_point_position += len(current_chunk)
-            
-        if progress_callback:
-            progress_callback(90, 100, "Creating DataFrame...")
-            
-        # Create time values based on sample rate
-        time_values = np.arange(len(voltage_values)) / sample_rate
-        
-        # Create DataFrame with our standard column names
-        data = pd.DataFrame({
-            'Second': time_values,
-            'Value': voltage_values
-        })
+
+        if data_line is not None:
+            for chunk in self.read_csv_chunks(file_path, progress_callback, cancel_token,
+                                              progress_range=(10, 90), chunksize=chunk_size,
+                                              assembler=assembler, metadata=metadata,
+                                              skiprows=data_line, header=None, names=['Value'],
+                                              usecols=[0]):
+                # Stray non-numeric lines become NaN and are dropped
+                values = pd.to_numeric(chunk['Value'], errors='coerce').to_numpy(dtype=np.float64)
+                values = values[~np.isnan(values)]
+                frame = self._chunk_frame(values, current_data_point_position, sample_rate)
+                assembler.append(frame)
+                if chunk_callback:
+                    chunk_callback(frame)
+                current_data_point_position += len(values)
+
+        # Time values are computed per chunk from the sample rate
+        data = assembler.finish()
+        if not assembler.columns:
+            data = pd.DataFrame({'Second': np.empty(0), 'Value': np.empty(0)})
         
         if progress_callback:
             progress_callback(100, 100, "Done!")
         
         return metadata, data
+
+    @staticmethod
+    def _chunk_frame(values, first_index, sample_rate):
+        """DataFrame for a block of voltage values starting at sample ``first_index``."""
+        time_values = np.arange(first_index, first_index + len(values)) / sample_rate
+        return pd.DataFrame({'Second': time_values, 'Value': values})
@@ -1,5 +1,3 @@
-import pandas as pd
-from pathlib import Path
 from .base_parser import OscilloscopeCSVParser
 
 class SiglentCSVParser(OscilloscopeCSVParser):
@@ -11,21 +9,20 @@ class SiglentCSVParser(OscilloscopeCSVParser):
                              any('Second,Value' in line for line in first_lines))
         return has_old_metadata or has_simple_header
         
-    def parse(self, file_path, progress_callback=None):
+    def parse(self, file_path, progress_callback=None, cancel_token=None,
+              chunk_callback=None, head=None, channels=None):
         metadata = {}
         metadata_lines = []
-        file_size = Path(file_path).stat().st_size
         
         if progress_callback:
             progress_callback(0, 100, "Reading metadata...")
         
         # Read metadata
-        with open(file_path, 'r') as f:
-            for i, line in enumerate(f):
-                if 'Second,Value' in line:
-                    break
-                metadata_lines.append(line)
-                
+        for i, line in enumerate(self.iter_lines(file_path, head)):
+            if 'Second,Value' in line:
+                break
+            metadata_lines.append(line)
+            
         # Parse metadata
         for line in metadata_lines:
             if ',' in line:
@@ -35,25 +32,20 @@ class SiglentCSVParser(OscilloscopeCSVParser):
         if progress_callback:
             progress_callback(10, 100, "Reading data...")
             
-        # Read data in chunks to show progress
-        chunks = []
+        # Read data in chunks to show progress, filling the columns in place
+        assembler = self.new_assembler()
         chunk_size = 100000  # Adjust based on memory constraints
         
-        for chunk in pd.read_csv(file_path, skiprows=len(metadata_lines),
-                               dtype={'Second': float, 'Value': float},
-                               chunksize=chunk_size):
-            chunks.append(chunk)
-            if progress_callback:
-                # Calculate progress based on number of chunks read
-                current_size = sum(len(c) for c in chunks) * chunk.memory_usage(deep=True).sum()
-                progress = min(90, int(10 + 80 * (current_size / file_size)))
-                progress_callback(progress, 100, f"Reading data... ({len(chunks) * chunk_size:,} points)")
+        for chunk in self.read_csv_chunks(file_path, progress_callback, cancel_token,
+                                          progress_range=(10, 90), chunksize=chunk_size,
+                                          assembler=assembler, metadata=metadata,
+                                          skiprows=len(metadata_lines),
+                                          dtype={'Second': float, 'Value': float}):
+            assembler.append(chunk)
+            if chunk_callback:
+                chunk_callback(chunk)
         
-        if progress_callback:
-            progress_callback(90, 100, "Combining data chunks...")
-            
-        # Combine all chunks
-        data = pd.concat(chunks, ignore_index=True)
+        data = assembler.finish()
         
         if progress_callback:
             progress_callback(100, 100, "Done!")
@@ -0,0 +1,101 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from benchmarks.generators import FORMATS
+from oscilloscope_core import CaptureCache, capture_memory, load_csv_capture
+
+
+def source(tmp_path, name='capture.csv', size=1000):
+    path = tmp_path / name
+    path.write_bytes(b'x' * size)
+    return path
+
+
+def store(cache, path, nbytes=1 << 16):
+    return cache.store(path, 'tag', {'Rows': [nbytes // 8]},
+                       {'column/Value': np.arange(nbytes // 8, dtype=np.float64)})
+
+
+def test_round_trip(tmp_path):
+    cache = CaptureCache(tmp_path / 'cache', budget_bytes=1 << 20)
+    path = source(tmp_path)
+    assert cache.load(path, 'tag') is None
+    assert store(cache, path)
+    metadata, arrays = cache.load(path, 'tag')
+    assert metadata == {'Rows': [8192]}
+    assert isinstance(arrays['column/Value'], np.memmap)
+    np.testing.assert_array_equal(arrays['column/Value'], np.arange(8192))
+    assert cache.load(path, 'other tag') is None
+
+
+def test_stale_entry_is_rejected(tmp_path):
+    cache = CaptureCache(tmp_path / 'cache', budget_bytes=1 << 20)
+    path = source(tmp_path)
+    store(cache, path)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert cache.load(path, 'tag') is None
+    store(cache, path)
+    assert cache.load(path, 'tag') is not None
+    path.write_bytes(b'y' * 1001)
+    os.utime(path, ns=(st.st_atime_ns, path.stat().st_mtime_ns))
+    assert cache.load(path, 'tag') is None
+
+
+def test_eviction_stays_within_budget(tmp_path):
+    cache = CaptureCache(tmp_path / 'cache', budget_bytes=200 << 10)
+    paths = [source(tmp_path, f'{i}.csv') for i in range(5)]
+    for i, path in enumerate(paths):
+        assert store(cache, path)
+        # Make the order of use unambiguous despite coarse file system timestamps
+        for age, (_, _, entry) in enumerate(reversed(cache.entries())):
+            t = 1_000_000 + i * 10 - age
+            os.utime(entry / 'index.json', (t, t))
+        assert cache.total_bytes() <= cache.budget_bytes
+    # Three 64 KiB entries fit, the least recently used ones were evicted
+    assert [cache.load(path, 'tag') is not None for path in paths] == [False, False, True, True, True]
+    # Entries larger than the whole budget are not stored at all
+    assert not store(cache, source(tmp_path, 'big.csv'), nbytes=256 << 10)
+
+
+def test_zero_budget_disables_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv('OSCILLOSCOPE_VIEWER_CACHE_MB', '0')
+    cache = CaptureCache(tmp_path / 'cache')
+    path = source(tmp_path)
+    assert not cache.enabled
+    assert not store(cache, path)
+    assert cache.load(path, 'tag') is None
+    assert not (tmp_path / 'cache').exists()
+    monkeypatch.setenv('OSCILLOSCOPE_VIEWER_CACHE_MB', 'lots')
+    assert CaptureCache(tmp_path / 'cache').enabled
+
+
+def test_value_alias_is_stored_once(tmp_path):
+    path = tmp_path / 'display.csv'
+    FORMATS['batronix_display'].write(path, 64 << 10)
+    cache = CaptureCache(tmp_path / 'cache', budget_bytes=1 << 30)
+    _, parsed, _ = load_csv_capture(path, cache=cache, channels=[2, 3])
+    (_, _, entry), = cache.entries()
+    stored = [name for name, _ in json.loads((entry / 'index.json').read_text())['arrays']]
+    assert 'column/Value' not in stored and 'alias/Value' in stored
+
+    _, data, pyramids = load_csv_capture(path, cache=cache, channels=[2, 3])
+    assert list(data.columns) == list(parsed.columns)
+    for col in data.columns:
+        np.testing.assert_array_equal(data[col].values, parsed[col].values)
+    assert set(pyramids) == {'Value_CH2', 'Value_CH3'}
+    entries = {e['column']: e for e in capture_memory(data)}
+    assert entries['Value']['shared_with'] == 'Value_CH2'
+
+
+@pytest.mark.parametrize('format_name', ['siglent', 'rigol'])
+def test_single_channel_value_is_stored(tmp_path, format_name):
+    path = tmp_path / f'{format_name}.csv'
+    FORMATS[format_name].write(path, 16 << 10)
+    cache = CaptureCache(tmp_path / 'cache', budget_bytes=1 << 30)
+    _, parsed, _ = load_csv_capture(path, cache=cache)
+    _, data, _ = load_csv_capture(path, cache=cache)
+    np.testing.assert_array_equal(data['Value'].values, parsed['Value'].values)
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from parsers import ColumnAssembler
+
+
+def chunks(sizes, seed=5):
+    rng = np.random.default_rng(seed)
+    first = 0
+    for size in sizes:
+        yield pd.DataFrame({'Second': np.arange(first, first + size) * 1e-6,
+                            'Value': rng.standard_normal(size)})
+        first += size
+
+
+@pytest.mark.parametrize('capacity', [0, 1, 1000])
+@pytest.mark.parametrize('value_dtype', [np.float64, np.float32])
+def test_growth_across_chunk_boundaries(capacity, value_dtype):
+    sizes = [1, 7, 0, 1000, 3, 4096, 999, 1]
+    parts = list(chunks(sizes))
+    assembler = ColumnAssembler(capacity, value_dtype=value_dtype)
+    views = []
+    for part in parts:
+        assembler.append(part)
+        # Views taken before the columns grow keep their rows
+        views.append((assembler.length, assembler.columns['Value'][:assembler.length]))
+    data = assembler.finish()
+
+    expected = pd.concat(parts, ignore_index=True)
+    assert len(data) == sum(sizes) == assembler.capacity
+    assert data['Second'].dtype == np.float64 and data['Value'].dtype == value_dtype
+    np.testing.assert_array_equal(data['Second'].values, expected['Second'].values)
+    np.testing.assert_array_equal(data['Value'].values, expected['Value'].values.astype(value_dtype))
+    for length, view in views:
+        np.testing.assert_array_equal(view, data['Value'].values[:length])
+
+
+def test_expect_reserves_ahead():
+    assembler = ColumnAssembler()
+    parts = list(chunks([500] * 10))
+    assembler.append(parts[0])
+    assembler.expect(5000)
+    reserved = assembler.columns['Value']
+    for part in parts[1:]:
+        assembler.append(part)
+    # Nothing was reallocated, and the small slack is kept rather than copied away
+    assert assembler.columns['Value'] is reserved
+    data = assembler.finish()
+    assert np.shares_memory(data['Value'].values, reserved)
+    np.testing.assert_array_equal(data['Value'].values,
+                                  pd.concat(parts, ignore_index=True)['Value'].values)
+
+
+def test_finish_trims_large_slack():
+    assembler = ColumnAssembler(capacity=10_000)
+    part, = chunks([100])
+    assembler.append(part)
+    reserved = assembler.columns['Value']
+    data = assembler.finish()
+    assert not np.shares_memory(data['Value'].values, reserved)
+    np.testing.assert_array_equal(data['Value'].values, part['Value'].values)
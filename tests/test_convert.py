@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from benchmarks.generators import BINARY_PARAMS, FORMATS
+from oscilloscope_core import capture_time_axis, load_binary_capture, load_csv_capture, value_scaling
+from oscilloscope_core.convert import convert_capture, read_converted
+
+def output_formats():
+    """npz, plus parquet where pyarrow is installed."""
+    yield 'npz'
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return
+    yield 'parquet'
+
+
+@pytest.mark.parametrize('fmt', list(output_formats()))
+@pytest.mark.parametrize('format_name', ['siglent', 'batronix_display'])
+def test_csv_round_trip(tmp_path, fmt, format_name):
+    path = tmp_path / f'{format_name}.csv'
+    FORMATS[format_name].write(path, 32 << 10)
+    summary = convert_capture(path, tmp_path / f'out.{fmt}', fmt)
+    metadata, data = read_converted(summary['output'])
+    expected_metadata, expected, _ = load_csv_capture(path, pyramids=False)
+    assert list(data.columns) == list(expected.columns) == summary['columns']
+    for col in expected.columns:
+        np.testing.assert_array_equal(data[col].values, expected[col].values)
+    assert metadata.get('Channels') == expected_metadata.get('Channels')
+
+
+@pytest.mark.parametrize('fmt', list(output_formats()))
+@pytest.mark.parametrize('storage', ['float64', 'float32', 'native'])
+def test_binary_round_trip_has_time_column(tmp_path, fmt, storage):
+    path = tmp_path / 'capture.bin'
+    FORMATS['binary'].write(path, 64 << 10)
+    params = dict(BINARY_PARAMS, storage_dtype=storage)
+    summary = convert_capture(path, tmp_path / f'out.{fmt}', fmt, binary_params=params)
+    metadata, data = read_converted(summary['output'])
+    expected_metadata, expected, _ = load_binary_capture(path, params, pyramids=False)
+
+    assert data.columns[0] == 'Second'
+    np.testing.assert_array_equal(data['Second'].values,
+                                  capture_time_axis(expected_metadata, expected)[:])
+    for col in expected.columns:
+        assert data[col].dtype == expected[col].dtype
+        np.testing.assert_array_equal(data[col].values, expected[col].values)
+    assert value_scaling(metadata) == value_scaling(expected_metadata)
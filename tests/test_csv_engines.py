@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.generators import FORMATS
+from oscilloscope_core import csv_cache_tag
+from parsers import PARSER_REGISTRY
+from parsers.csv_engines import PandasCSVEngine
+
+pytest.importorskip('pyarrow')
+from parsers.csv_engines import PyArrowCSVEngine  # noqa: E402
+
+CSV_FORMATS = [name for name, fmt in FORMATS.items() if fmt.suffix == '.csv']
+
+
+def parse(path, engine, workers=1, block_bytes=8 << 20):
+    """Parse ``path`` with a fresh instance of the parser picked for it."""
+    sniffed, head = PARSER_REGISTRY.sniff(path)
+    parser = type(sniffed)()
+    parser.engine = engine
+    parser.workers = workers
+    parser.parallel_block_bytes = block_bytes
+    return parser.parse(path, head=head)
+
+
+def sample(tmp_path, format_name, size=64 << 10):
+    path = tmp_path / f'{format_name}.csv'
+    FORMATS[format_name].write(path, size)
+    return path
+
+
+@pytest.mark.parametrize('format_name', CSV_FORMATS)
+def test_pyarrow_matches_pandas(tmp_path, format_name):
+    path = sample(tmp_path, format_name)
+    _, expected = parse(path, 'pandas')
+    # Small ranges on several threads, to cover the block boundaries as well
+    _, actual = parse(path, 'pyarrow', workers=3, block_bytes=5000)
+    pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+
+
+def ragged(path, edit_rows):
+    """Rewrite the data rows of a Siglent sample with ``edit_rows(rows)``."""
+    lines = path.read_text().splitlines()
+    header = next(i for i, line in enumerate(lines) if line.startswith('Second,Value')) + 1
+    path.write_text('\n'.join(lines[:header] + edit_rows(lines[header:])) + '\n')
+    return path
+
+
+@pytest.mark.parametrize('edit_rows', [
+    lambda rows: rows[:-1] + ['1.000000E-02'],  # truncated last row
+    lambda rows: [row + ',' for row in rows],  # trailing comma on every row
+], ids=['truncated', 'trailing-commas'])
+@pytest.mark.parametrize('workers', [1, 3])
+def test_ragged_rows_load_like_pandas(tmp_path, edit_rows, workers):
+    path = ragged(sample(tmp_path, 'siglent'), edit_rows)
+    _, expected = parse(path, 'pandas')
+    _, actual = parse(path, 'pyarrow', workers=workers, block_bytes=5000)
+    pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+
+
+def test_long_decimals_within_one_ulp():
+    # Up to 15 significant digits (scopes write 7) both engines agree exactly. With 16,
+    # pandas' default float converter is not correctly rounded and can be 1 ULP off;
+    # pyarrow is, and so is pandas with float_precision='round_trip'
+    values = np.random.default_rng(0).uniform(-10, 10, 20000)
+    names = ['Second', 'Value']
+    kwargs = {'dtype': {'Second': float, 'Value': float}}
+
+    def read(digits):
+        block = '\n'.join(f'{v:.{digits - 1}e},{v:.{digits - 1}e}' for v in values).encode() + b'\n'
+        return (PyArrowCSVEngine().read_block(block, names, kwargs)['Value'].values,
+                PandasCSVEngine().read_block(block, names, kwargs)['Value'].values,
+                PandasCSVEngine().read_block(block, names, dict(kwargs, float_precision='round_trip'))
+                ['Value'].values)
+
+    arrow, default, exact = read(15)
+    np.testing.assert_array_equal(arrow, default)
+    arrow, default, exact = read(16)
+    assert (arrow != default).any()
+    np.testing.assert_array_max_ulp(arrow, default, maxulp=1)
+    np.testing.assert_array_equal(arrow, exact)
+
+
+def test_cache_tag_includes_engine():
+    sniffed = PARSER_REGISTRY.parsers[0]
+    tags = set()
+    for engine in ('pandas', 'pyarrow'):
+        parser = type(sniffed)()
+        parser.engine = engine
+        tags.add(csv_cache_tag(parser))
+    assert len(tags) == 2
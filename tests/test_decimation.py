@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from oscilloscope_core import GrowingOverview, MinMaxPyramid, UniformTimeAxis, decimate_data
+
+
+@pytest.fixture(scope='module')
+def signal():
+    rng = np.random.default_rng(1)
+    y = np.cumsum(rng.standard_normal(1 << 20)).astype(np.float32)
+    x = np.arange(len(y)) / 1e6
+    return x, y, MinMaxPyramid.build(y, min_buckets=64)
+
+
+def random_slices(n, count=50, seed=2):
+    rng = np.random.default_rng(seed)
+    for _ in range(count):
+        start, stop = sorted(int(i) for i in rng.integers(0, n, 2))
+        if stop > start:
+            yield start, stop
+
+
+def level_factor(pyramid, start, stop, max_points):
+    """Bucket size of the level ``decimate`` picks for [start, stop)."""
+    wanted = (stop - start) // max(1, max_points // 2)
+    return max(f for f, _, _ in pyramid.levels if f <= wanted)
+
+
+def test_pyramid_matches_raw_envelope(signal):
+    x, y, pyramid = signal
+    for start, stop in random_slices(len(y)):
+        for max_points in (100, 1000, 10000):
+            result = pyramid.decimate(x, start, stop, max_points)
+            if result is None:
+                assert (stop - start) // (max_points // 2) < pyramid.levels[0][0]
+                continue
+            px, py = result
+            mins, maxs = py[0::2], py[1::2]
+            # The buckets cover the slice, widened to the level's bucket boundaries
+            factor = level_factor(pyramid, start, stop, max_points)
+            edges = np.rint(px[0::2] * 1e6).astype(np.intp)
+            assert edges[0] == start - start % factor
+            assert edges[-1] < stop
+            # Each point pair is the exact envelope of the samples from its x up to the next
+            edges = np.append(edges, min(len(y), -(-stop // factor) * factor))
+            for i in range(len(mins)):
+                chunk = y[edges[i]:edges[i + 1]]
+                assert mins[i] == chunk.min() and maxs[i] == chunk.max()
+            # Same envelope as decimating the raw samples, and at least as many points
+            dx, dy = decimate_data(x[start:stop], y[start:stop], max_points)
+            assert py.min() <= dy.min() and py.max() >= dy.max()
+            assert max_points <= len(py) <= 2 * max_points + 2
+
+
+def test_pyramid_unaligned_edges(signal):
+    x, y, pyramid = signal
+    factor = pyramid.levels[0][0]
+    for start, stop in ((factor + 1, 50 * factor - 1), (3, 40 * factor + 5),
+                        (len(y) - 37 * factor - 3, len(y))):
+        px, py = pyramid.decimate(x, start, stop, max_points=20)
+        assert len(px) == len(py)
+        assert px[0] == x[start - start % level_factor(pyramid, start, stop, 20)]
+        assert py.min() <= y[start:stop].min() and py.max() >= y[start:stop].max()
+
+
+def test_pyramid_short_span(signal):
+    x, y, pyramid = signal
+    factor = pyramid.levels[0][0]
+    assert pyramid.decimate(x, 100, 100 + factor - 1, max_points=2) is None
+    assert pyramid.decimate(x, 100, 120, max_points=10000) is None
+
+
+def test_pyramid_respects_max_points(signal):
+    x, y, pyramid = signal
+    for max_points in (64, 1000, 5000):
+        _, py = pyramid.decimate(x, 0, len(y), max_points)
+        assert max_points <= len(py) <= 2 * max_points
+
+
+def test_pyramid_round_trip(signal):
+    _, _, pyramid = signal
+    restored = MinMaxPyramid.from_arrays(pyramid.to_arrays('p/'), 'p/')
+    assert [f for f, _, _ in restored.levels] == [f for f, _, _ in pyramid.levels]
+    for (_, mins, maxs), (_, rmins, rmaxs) in zip(pyramid.levels, restored.levels):
+        np.testing.assert_array_equal(mins, rmins)
+        np.testing.assert_array_equal(maxs, rmaxs)
+
+
+def test_growing_overview():
+    rng = np.random.default_rng(3)
+    y = rng.standard_normal(100_003)
+    x = np.arange(len(y), dtype=np.float64)
+    overview = GrowingOverview(max_points=1000)
+    for first in range(0, len(y), 7919):
+        overview.append(x[first:first + 7919], y[first:first + 7919])
+    assert overview.samples == len(y)
+    assert len(overview.mins) <= 500
+    # Buckets merged while their count was odd are smaller than the others, but every
+    # one is the exact envelope of the samples from its x up to the next bucket's
+    edges = np.append(overview.x.astype(np.intp), len(y) - len(overview._tail_y))
+    assert edges[0] == 0 and np.all(np.diff(edges) > 0)
+    for i in range(len(overview.mins)):
+        chunk = y[edges[i]:edges[i + 1]]
+        assert overview.mins[i] == chunk.min() and overview.maxs[i] == chunk.max()
+    assert len(overview._tail_y) < overview.factor
+    ox, oy = overview.data()
+    assert len(ox) == len(oy) == 2 * len(overview.mins)
+
+
+@pytest.mark.parametrize('sample_rate, start', [(1e9, 0.0), (3e6, -0.0125), (44100.0, 1.5)])
+def test_uniform_time_axis_searchsorted(sample_rate, start):
+    axis = UniformTimeAxis(10_000, sample_rate, start)
+    times = axis[:]
+    np.testing.assert_array_equal(times, start + np.arange(10_000) / sample_rate)
+    rng = np.random.default_rng(4)
+    values = np.concatenate((
+        times[rng.integers(0, len(times), 200)],  # exactly on samples
+        rng.uniform(times[0] - 1 / sample_rate, times[-1] + 1 / sample_rate, 200),
+        [times[0] - 1, times[-1] + 1],
+    ))
+    for side in ('left', 'right'):
+        np.testing.assert_array_equal(axis.searchsorted(values, side=side),
+                                      np.searchsorted(times, values, side=side))
+        assert np.searchsorted(axis, times[5], side=side) == np.searchsorted(times, times[5], side=side)
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from oscilloscope_core import capture_memory, resident_bytes
+
+
+def test_interleaved_channels_are_not_shared():
+    interleaved = np.arange(3000, dtype=np.int16).reshape(-1, 3)
+    data = pd.DataFrame({'Value_CH1': interleaved[:, 0], 'Value_CH2': interleaved[:, 1],
+                         'Value_CH3': interleaved[:, 2], 'Value': interleaved[:, 0]}, copy=False)
+    entries = {e['column']: e for e in capture_memory(data)}
+    for ch in (1, 2, 3):
+        entry = entries[f'Value_CH{ch}']
+        assert entry['shared_with'] is None
+        assert entry['bytes'] == 1000 * 2
+        assert entry['channel'] == ch
+    assert entries['Value']['shared_with'] == 'Value_CH1'
+    assert entries['Value']['bytes'] == 0
+
+
+def test_mapped_columns_are_not_resident(tmp_path):
+    path = tmp_path / 'capture.bin'
+    np.arange(4000, dtype='<i2').tofile(path)
+    mapped = np.memmap(path, dtype='<i2', mode='r').reshape(-1, 2)
+    data = pd.DataFrame({'Second': np.zeros(2000), 'Value_CH1': mapped[:, 0],
+                         'Value_CH2': mapped[:, 1]}, copy=False)
+    entries = capture_memory(data)
+    assert [e['mapped'] for e in entries] == [False, True, True]
+    assert [e['shared_with'] for e in entries] == [None, None, None]
+    assert resident_bytes(entries) == 2000 * 8